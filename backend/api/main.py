@@ -1,22 +1,139 @@
 """
 FastAPI main application.
 """
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
+import json
 import sys
 import os
+import threading
+import time
 
 # Add backend directory to path
 backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, backend_dir)
 
-from sudoku.solver import SudokuSolver
-from sudoku.generator import SudokuGenerator
-from ocr.image_processor import SudokuOCR
+from sudoku.engines import SOLVER_ENGINES, DEFAULT_ENGINE
+from sudoku.pool import PuzzlePool
+from sudoku.batch import chunk_grids
+from sudoku.cache import SolutionCache
+from sudoku.generator import SudokuGenerator, clue_difficulty
+from sudoku.grid import GRID_SIZES, bytes_to_string, from_bytes, to_cells
+from sudoku.solver import SolverTimeout
+from sudoku.tasks import solve_task, solve_many_task, generate_task
+from ocr.cache import OCRCache
+from ocr.repair import repair_grid
+from api.metrics import MetricsMiddleware, errors_total, observe_stages, registry, stage_duration
+from api.uploads import UploadTooLarge, read_upload
+from api.workers import WorkerPool, WorkerPoolSaturated
 
-app = FastAPI(title="Sudoku Arena API")
+# Worker processes for solve/generate; SUDOKU_WORKERS=0 runs them in threads
+SUDOKU_WORKERS = int(os.environ.get("SUDOKU_WORKERS", str(os.cpu_count() or 1)))
+# Requests allowed to wait for a busy worker before returning 503
+SUDOKU_WORKER_QUEUE = int(os.environ.get("SUDOKU_WORKER_QUEUE", str(4 * max(SUDOKU_WORKERS, 1))))
+# Per-request time limits in seconds
+SOLVE_TIMEOUT = float(os.environ.get("SOLVE_TIMEOUT", "10"))
+GENERATE_TIMEOUT = float(os.environ.get("GENERATE_TIMEOUT", "30"))
+# Seconds of work per generated puzzle, kept below GENERATE_TIMEOUT so workers
+# stop soon after a request gives up. 16x16 and 25x25 puzzles still being
+# thinned out when it runs out are returned with the clues they have; graded
+# generation returns its closest candidate so far
+GENERATE_TIME_BUDGET = float(os.environ.get("GENERATE_TIME_BUDGET", "10"))
+# Grids sent to a worker at a time by /api/solve/batch
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", "64"))
+# Most grids accepted by one /api/solve/batch request (413 above it)
+BATCH_MAX_GRIDS = int(os.environ.get("BATCH_MAX_GRIDS", "10000"))
+
+# Solve results cached by canonical puzzle; SOLUTION_CACHE_SIZE=0 disables the cache
+SOLUTION_CACHE_SIZE = int(os.environ.get("SOLUTION_CACHE_SIZE", "4096"))
+SOLUTION_CACHE_TTL = float(os.environ.get("SOLUTION_CACHE_TTL", "86400"))
+
+# Default /api/generate/ method: "search" (generate from scratch), "graded"
+# (generate until the technique rating matches the difficulty) or "seeds"
+# (random symmetry transform of a stored seed puzzle, no search)
+GENERATE_METHODS = ("search", "graded", "seeds")
+GENERATE_METHOD = os.environ.get("GENERATE_METHOD", "search")
+
+# Pre-generated puzzles per difficulty; PUZZLE_POOL_SIZE=0 disables the pool
+PUZZLE_POOL_SIZE = int(os.environ.get("PUZZLE_POOL_SIZE", "20"))
+PUZZLE_POOL_LOW_WATER = int(os.environ.get("PUZZLE_POOL_LOW_WATER", "5"))
+
+# Serve /api/ocr/; OCR_ENABLED=0 runs a solve/generate-only instance that never
+# imports the OCR dependencies (OpenCV, NumPy, Pillow, pytesseract)
+OCR_ENABLED = os.environ.get("OCR_ENABLED", "1") != "0"
+# Digit recognizer for /api/ocr/: "template" (built-in NumPy classifier) or
+# "tesseract"; template reads below OCR_MIN_CONFIDENCE are retried with Tesseract
+OCR_ENGINE = os.environ.get("OCR_ENGINE", "template")
+OCR_MIN_CONFIDENCE = float(os.environ.get("OCR_MIN_CONFIDENCE", "0.6"))
+# Correct misreads with the solver (OCR_REPAIR=0 returns the raw read)
+OCR_REPAIR = os.environ.get("OCR_REPAIR", "1") != "0"
+# Largest accepted /api/ocr/ upload in bytes
+OCR_MAX_UPLOAD_BYTES = int(os.environ.get("OCR_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# OCR requests decoded and recognized at once; the rest wait their turn
+OCR_CONCURRENCY = int(os.environ.get("OCR_CONCURRENCY", str(os.cpu_count() or 1)))
+# Reads cached per level (upload hash, grid image hash); OCR_CACHE_SIZE=0
+# disables the cache. With OCR_CACHE_PATH it is saved there on shutdown and
+# reloaded on startup
+OCR_CACHE_SIZE = int(os.environ.get("OCR_CACHE_SIZE", "1024"))
+OCR_CACHE_PATH = os.environ.get("OCR_CACHE_PATH") or None
+
+# Request timing middleware and the Prometheus /metrics endpoint (METRICS=0 disables both)
+METRICS = os.environ.get("METRICS", "1") != "0"
+
+worker_pool = WorkerPool(max_workers=SUDOKU_WORKERS, max_queue=SUDOKU_WORKER_QUEUE)
+
+# OpenCV and NumPy release the GIL, so OCR runs in threads
+ocr_slots = asyncio.Semaphore(max(OCR_CONCURRENCY, 1))
+
+# One SudokuOCR shared by all OCR threads, created by get_ocr()
+ocr_reader = None
+ocr_reader_lock = threading.Lock()
+
+ocr_cache = (
+    OCRCache(max_size=OCR_CACHE_SIZE, path=OCR_CACHE_PATH)
+    if OCR_ENABLED and OCR_CACHE_SIZE > 0 else None
+)
+
+solution_cache = (
+    SolutionCache(max_size=SOLUTION_CACHE_SIZE, ttl=SOLUTION_CACHE_TTL)
+    if SOLUTION_CACHE_SIZE > 0 else None
+)
+
+puzzle_pool = (
+    PuzzlePool(
+        target_size=PUZZLE_POOL_SIZE,
+        low_water=PUZZLE_POOL_LOW_WATER,
+        generate=lambda difficulty: worker_pool.call(
+            generate_task, difficulty, DEFAULT_ENGINE, GENERATE_METHOD, 9, GENERATE_TIME_BUDGET
+        ),
+    )
+    if PUZZLE_POOL_SIZE > 0 and GENERATE_METHOD != "seeds" else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers on startup and stop them on shutdown."""
+    worker_pool.start()
+    if puzzle_pool is not None:
+        puzzle_pool.start()
+    if ocr_cache is not None:
+        await run_in_threadpool(ocr_cache.load)
+    yield
+    if puzzle_pool is not None:
+        puzzle_pool.stop(timeout=5)
+    worker_pool.shutdown()
+    if ocr_cache is not None:
+        ocr_cache.save()
+
+
+app = FastAPI(title="Sudoku Arena API", lifespan=lifespan)
 
 # CORS middleware
 frontend_url = os.environ.get("FRONTEND_URL", "*")
@@ -28,24 +145,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if METRICS:
+    app.add_middleware(MetricsMiddleware, skip_paths=("/metrics",))
+
 
 class GenerateRequest(BaseModel):
     difficulty: str = "medium"
+    # "search", "graded" or "seeds"; defaults to GENERATE_METHOD (always
+    # "search" for 16x16 and 25x25 grids)
+    method: Optional[str] = None
+    # Grid side length: 9, 16 or 25
+    size: int = 9
 
 
 class GenerateResponse(BaseModel):
     puzzle: List[List[int]]
     solution: List[List[int]]
+    # Difficulty the puzzle actually has: by clue count for "search" (which
+    # can stop short of the difficulty asked for), by technique rating for
+    # "graded" and "seeds"
+    difficulty: str
+    clues: int
 
 
 class SolveRequest(BaseModel):
-    grid: List[List[int]]
+    # 9x9, 16x16 or 25x25 list, or a string of 81, 256 or 625 characters
+    # ('.' or '0' = empty, A-P for 10-25)
+    grid: Union[List[List[int]], str]
+    engine: str = DEFAULT_ENGINE
+    # Include the solver's search counters in the response
+    stats: bool = False
 
 
 class SolveResponse(BaseModel):
     solved: bool
-    solution: Optional[List[List[int]]] = None
+    # Same format as the request grid
+    solution: Optional[Union[List[List[int]], str]] = None
     error: Optional[str] = None
+    # Search counters (nodes, backtracks, branches, max_depth,
+    # candidate_computations, propagations, elapsed) when requested
+    stats: Optional[Dict[str, Union[int, float]]] = None
+
+
+class DigitAlternative(BaseModel):
+    digit: int  # 0 = blank
+    confidence: float
+
+
+class OCREdit(BaseModel):
+    row: int
+    col: int
+    read: int  # Digit as read by OCR
+    digit: int  # Digit after repair (0 = blank)
+
+
+class OCRResponse(BaseModel):
+    # Repaired grid when a repair was found, otherwise the grid as read
+    grid: List[List[int]]
+    confidence: Optional[List[List[float]]] = None
+    # Up to 3 alternatives per cell, best first
+    alternatives: Optional[List[List[List[DigitAlternative]]]] = None
+    repaired: bool = False
+    edits: List[OCREdit] = []
+
+
+class BatchSolveRequest(BaseModel):
+    # Each grid is a list or a string, in any SolveRequest grid format
+    grids: List[Union[str, List[List[int]]]]
+    engine: str = DEFAULT_ENGINE
+
+
+# Error messages for unsuccessful solve_task results
+SOLVE_ERRORS = {
+    'invalid': "Invalid grid: contains conflicts",
+    'unsolvable': "Puzzle is unsolvable",
+    'timeout': "Solver timed out",
+}
+
+
+def format_solution(cells: bytes, request_grid: Union[List[List[int]], str]):
+    """Convert solution cell bytes to the format the grid was submitted in."""
+    if isinstance(request_grid, str):
+        return bytes_to_string(cells)
+    return from_bytes(cells)
 
 
 @app.get("/")
@@ -54,73 +236,329 @@ def root():
 
 
 @app.post("/api/generate/", response_model=GenerateResponse)
-def generate_puzzle(request: GenerateRequest):
-    """Generate a Sudoku puzzle with specified difficulty."""
+async def generate_puzzle(request: GenerateRequest):
+    """Generate a Sudoku puzzle with specified difficulty and size."""
+    if request.size not in GRID_SIZES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown size: expected one of {', '.join(map(str, GRID_SIZES))}"
+        )
+    method = request.method or (GENERATE_METHOD if request.size == 9 else "search")
+    if method not in GENERATE_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown method: expected one of {', '.join(GENERATE_METHODS)}"
+        )
+    if request.size != 9 and method != "search":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Method {method} only generates 9x9 puzzles"
+        )
     try:
-        generator = SudokuGenerator()
-        puzzle, solution = generator.generate(request.difficulty.lower())
-        return GenerateResponse(puzzle=puzzle, solution=solution)
+        difficulty = request.difficulty.lower()
+        if method == "seeds":
+            # Seed transforms take microseconds, so skip the pool and workers
+            item = generate_task(difficulty, DEFAULT_ENGINE, method)
+        else:
+            # The pool holds 9x9 puzzles made with the default method
+            item = None
+            if puzzle_pool is not None and method == GENERATE_METHOD and request.size == 9:
+                item = puzzle_pool.try_get(difficulty)
+            if item is None:
+                start = time.perf_counter()
+                item = await worker_pool.run(
+                    generate_task, difficulty, DEFAULT_ENGINE, method, request.size,
+                    GENERATE_TIME_BUDGET, timeout=GENERATE_TIMEOUT
+                )
+                stage_duration.observe(time.perf_counter() - start, stage="generate")
+        puzzle, solution = item
+        if method == "search":
+            difficulty = clue_difficulty(puzzle)
+        elif difficulty not in SudokuGenerator.DIFFICULTY_SETTINGS:
+            difficulty = "medium"  # What the generator made of it
+        return GenerateResponse(
+            puzzle=puzzle, solution=solution, difficulty=difficulty,
+            clues=sum(1 for row in puzzle for num in row if num),
+        )
+    except WorkerPoolSaturated:
+        errors_total.inc(type="worker_pool_saturated")
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
+    except (asyncio.TimeoutError, SolverTimeout):
+        errors_total.inc(type="timeout")
+        raise HTTPException(status_code=504, detail="Puzzle generation timed out")
     except Exception as e:
+        errors_total.inc(type=type(e).__name__)
         raise HTTPException(status_code=500, detail=f"Error generating puzzle: {str(e)}")
 
 
 @app.post("/api/solve/", response_model=SolveResponse)
-def solve_puzzle(request: SolveRequest):
+async def solve_puzzle(request: SolveRequest):
     """Solve a Sudoku puzzle."""
     try:
-        grid = request.grid
-        
-        # Validate grid format
-        if len(grid) != 9:
-            return SolveResponse(solved=False, error="Grid must have 9 rows")
-        
-        for row in grid:
-            if len(row) != 9:
-                return SolveResponse(solved=False, error="Each row must have 9 columns")
-            for cell in row:
-                if not isinstance(cell, int) or cell < 0 or cell > 9:
-                    return SolveResponse(solved=False, error="Cells must be integers 0-9")
+        # Validate grid format and convert to compact cell bytes
+        try:
+            cells = bytes(to_cells(request.grid))
+        except ValueError as e:
+            return SolveResponse(solved=False, error=str(e))
         
-        solver = SudokuSolver(grid)
+        if request.engine not in SOLVER_ENGINES:
+            return SolveResponse(
+                solved=False,
+                error=f"Unknown engine: expected one of {', '.join(SOLVER_ENGINES)}"
+            )
         
-        # Check if grid is valid
-        if not solver.is_valid_grid():
-            return SolveResponse(solved=False, error="Invalid grid: contains conflicts")
+        # Same puzzle up to symmetry solved before? Stats need a fresh search.
+        # Canonical forms are only defined for 9x9 grids
+        cache = solution_cache if len(cells) == 81 else None
+        result = None
+        if cache is not None:
+            cache_key, result = cache.lookup(cells)
+            if request.stats:
+                result = None
         
-        # Solve
-        solution = solver.get_solution()
+        if result is None:
+            # Solve in a worker; the solver stops itself at SOLVE_TIMEOUT and the
+            # extra second covers process overhead
+            start = time.perf_counter()
+            result = await worker_pool.run(
+                solve_task, cells, request.engine, SOLVE_TIMEOUT, request.stats,
+                timeout=SOLVE_TIMEOUT + 1
+            )
+            stage_duration.observe(time.perf_counter() - start, stage="solve")
+            
+            if result['status'] == 'timeout':
+                raise asyncio.TimeoutError()
+            if cache is not None:
+                cache.store(
+                    cache_key, {k: v for k, v in result.items() if k != 'stats'}
+                )
         
-        if solution:
-            return SolveResponse(solved=True, solution=solution)
+        stats = result.get('stats') if request.stats else None
+        if result['status'] == 'solved':
+            return SolveResponse(
+                solved=True, solution=format_solution(result['solution'], request.grid),
+                stats=stats,
+            )
         else:
-            return SolveResponse(solved=False, error="Puzzle is unsolvable")
+            return SolveResponse(solved=False, error=SOLVE_ERRORS[result['status']], stats=stats)
     
+    except WorkerPoolSaturated:
+        errors_total.inc(type="worker_pool_saturated")
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
+    except asyncio.TimeoutError:
+        errors_total.inc(type="timeout")
+        raise HTTPException(status_code=504, detail="Solver timed out")
     except Exception as e:
+        errors_total.inc(type=type(e).__name__)
         raise HTTPException(status_code=500, detail=f"Error solving puzzle: {str(e)}")
 
 
-@app.post("/api/ocr/", response_model=SolveRequest)
-def process_image(file: UploadFile = File(...)):
-    """Process uploaded image and extract Sudoku grid."""
+@app.post("/api/solve/batch")
+async def solve_batch(request: BatchSolveRequest):
+    """
+    Solve many puzzles in one request. Results are streamed as NDJSON, one
+    {"index", "solved", "solution", "error"} object per grid in completion
+    order; solutions use the same format (list or string) as the input grid.
+    """
+    if request.engine not in SOLVER_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown engine: expected one of {', '.join(SOLVER_ENGINES)}"
+        )
+    
+    if len(request.grids) > BATCH_MAX_GRIDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many grids: at most {BATCH_MAX_GRIDS} per batch"
+        )
+    
+    chunks, errors = chunk_grids(request.grids, BATCH_CHUNK_SIZE)
+    
+    # The whole batch takes one queue slot. It is taken when streaming starts,
+    # so a response that is never sent cannot leak it; a full queue is
+    # checked here so the client still gets a 503 in the common case
     try:
-        # Read image bytes
-        image_bytes = file.file.read()
-        
-        # Process with OCR
-        ocr = SudokuOCR()
-        grid = ocr.process_image_bytes(image_bytes)
+        worker_pool.check()
+    except WorkerPoolSaturated:
+        errors_total.inc(type="worker_pool_saturated")
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
+    
+    def line(index: int, result: Dict) -> str:
+        solution = result.get('solution')
+        if solution is not None:
+            solution = format_solution(solution, request.grids[index])
+        return json.dumps({
+            "index": index,
+            "solved": result['status'] == 'solved',
+            "solution": solution,
+            "error": result.get('error') or SOLVE_ERRORS.get(result['status']),
+        }) + "\n"
+    
+    async def stream():
+        for index, result in errors:
+            yield line(index, result)
+        try:
+            worker_pool.reserve()
+        except WorkerPoolSaturated:
+            # Filled up since the check: report every grid as not solved
+            errors_total.inc(type="worker_pool_saturated")
+            busy = {'status': 'error', 'error': "Server busy, try again later"}
+            for chunk in chunks:
+                yield "".join(line(index, busy) for index, _ in chunk)
+            return
+        try:
+            async for results in worker_pool.map_unordered(
+                solve_many_task, chunks, request.engine, SOLVE_TIMEOUT
+            ):
+                yield "".join(line(index, result) for index, result in results)
+        finally:
+            worker_pool.release()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/api/stats/")
+def get_stats():
+    """Runtime statistics for sizing the service."""
+    return {
+        "workers": worker_pool.stats(),
+        "solution_cache": solution_cache.stats() if solution_cache is not None else None,
+        "puzzle_pool": puzzle_pool.stats() if puzzle_pool is not None else None,
+        "ocr_cache": ocr_cache.stats() if ocr_cache is not None else None,
+    }
+
+
+def runtime_samples():
+    """Numeric /api/stats/ values as gauges for /metrics."""
+    stats = get_stats()
+    for key, value in stats["workers"].items():
+        yield f"sudoku_workers_{key}", f"Worker pool {key}.", {}, value
+    if stats["solution_cache"] is not None:
+        for key, value in stats["solution_cache"].items():
+            if isinstance(value, (int, float)):
+                yield f"sudoku_solution_cache_{key}", f"Solution cache {key}.", {}, value
+    if stats["puzzle_pool"] is not None:
+        for difficulty, pool_stats in stats["puzzle_pool"].items():
+            for key, value in pool_stats.items():
+                if isinstance(value, (int, float)):
+                    yield (f"sudoku_puzzle_pool_{key}", f"Puzzle pool {key} per difficulty.",
+                           {"difficulty": difficulty}, value)
+    if stats["ocr_cache"] is not None:
+        for level, level_stats in stats["ocr_cache"]["levels"].items():
+            for key, value in level_stats.items():
+                if isinstance(value, (int, float)):
+                    yield (f"sudoku_ocr_cache_{key}", f"OCR cache {key} per level.",
+                           {"level": level}, value)
+
+
+if METRICS:
+    registry.collectors.append(runtime_samples)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        """Request, stage and error metrics in the Prometheus text format."""
+        return PlainTextResponse(
+            registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
+# /api/ocr/ reads the multipart body itself, so describe it for the docs
+OCR_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+def get_ocr():
+    """The shared SudokuOCR, imported and loaded on the first call."""
+    global ocr_reader
+    with ocr_reader_lock:
+        if ocr_reader is None:
+            from ocr.image_processor import SudokuOCR
+            reader = SudokuOCR(engine=OCR_ENGINE, min_confidence=OCR_MIN_CONFIDENCE)
+            reader.load()
+            reader.cache = ocr_cache
+            ocr_reader = reader
+        return ocr_reader
+
+
+def read_grid(image_bytes: bytes):
+    """Decode, recognize and repair an uploaded grid (CPU-bound, runs in a thread)."""
+    result = get_ocr().read_image_bytes(image_bytes)
+    if result is None:
+        return None, None
+    
+    # Fix misread digits so the grid is valid and uniquely solvable
+    repair = None
+    if OCR_REPAIR:
+        start = time.perf_counter()
+        repair = repair_grid(result['grid'], result['confidence'], result['alternatives'])
+        result['timings']['repair'] = time.perf_counter() - start
+    return result, repair
+
+
+async def process_image(request: Request):
+    """
+    Process uploaded image and extract Sudoku grid. The image is the 'file'
+    field of a multipart form, or the raw request body.
+    """
+    try:
+        image_bytes = await read_upload(request, OCR_MAX_UPLOAD_BYTES)
+    except UploadTooLarge:
+        errors_total.inc(type="upload_too_large")
+        raise HTTPException(
+            status_code=413, detail=f"Image larger than {OCR_MAX_UPLOAD_BYTES} bytes"
+        )
+    except ValueError as e:
+        errors_total.inc(type="invalid_upload")
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        start = time.perf_counter()
+        async with ocr_slots:
+            stage_duration.observe(time.perf_counter() - start, stage="ocr_queue")
+            result, repair = await run_in_threadpool(read_grid, image_bytes)
         
-        if grid is None:
+        if result is None:
+            errors_total.inc(type="grid_not_found")
             raise HTTPException(status_code=400, detail="Failed to extract grid from image")
+        observe_stages(result['timings'], prefix="ocr_")
         
-        return SolveRequest(grid=grid)
+        return OCRResponse(
+            grid=repair['grid'] if repair else result['grid'],
+            confidence=result['confidence'],
+            alternatives=[
+                [[DigitAlternative(digit=d, confidence=p) for d, p in cell] for cell in row]
+                for row in result['alternatives']
+            ],
+            repaired=bool(repair and repair['edits']),
+            edits=[OCREdit(**edit) for edit in repair['edits']] if repair else [],
+        )
     
     except HTTPException:
         raise
     except Exception as e:
+        errors_total.inc(type=type(e).__name__)
         raise HTTPException(status_code=500, detail=f"Error processing image: {str(e)}")
 
 
+if OCR_ENABLED:
+    app.add_api_route(
+        "/api/ocr/", process_image, methods=["POST"],
+        response_model=OCRResponse, openapi_extra=OCR_REQUEST_BODY,
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,265 @@
+"""
+Request and stage metrics in the Prometheus text exposition format.
+
+A small in-process registry (no client library needed): counters, gauges
+and histograms with labels, safe to update from the event loop and from
+threadpool workers. MetricsMiddleware times every HTTP request.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, from fast solves to slow generations
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+# Gauge sample from a collector: (name, help text, labels, value)
+Sample = Tuple[str, str, Dict[str, str], float]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """{name="value",...} with values escaped, or '' without labels."""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Common part of the metric types: name, help text and label names."""
+
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}'
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set."""
+
+    kind = 'gauge'
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (last = +Inf), sum, count]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, [counts[:], total, count])
+                           for key, (counts, total, count) in self._series.items())
+        lines = []
+        names = self.label_names + ('le',)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    """
+    The metrics of a process, rendered together. Collectors are callables
+    run at render time that yield gauge samples (name, help, labels, value)
+    for state owned by other components (worker pool, caches).
+    """
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        # Samples of one family must be contiguous: group them by name
+        families: Dict[str, Tuple[str, List[str]]] = {}
+        for collector in self.collectors:
+            for name, help_text, labels, value in collector():
+                family = families.setdefault(name, (help_text, []))
+                family[1].append(
+                    f'{name}{_format_labels(tuple(labels), tuple(labels.values()))} '
+                    f'{_format_value(value)}'
+                )
+        for name, (help_text, samples) in families.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+requests_total = registry.counter(
+    'sudoku_http_requests_total', 'HTTP requests by endpoint and status code.',
+    ('method', 'endpoint', 'status'),
+)
+request_duration = registry.histogram(
+    'sudoku_http_request_duration_seconds',
+    'HTTP request latency until the response is complete (streams included).',
+    ('method', 'endpoint'),
+)
+requests_in_flight = registry.gauge(
+    'sudoku_http_requests_in_flight', 'HTTP requests being processed.',
+)
+requests_in_flight.set(0)
+stage_duration = registry.histogram(
+    'sudoku_stage_duration_seconds',
+    'Duration of pipeline stages (OCR stages, repair, solve, generate).', ('stage',),
+)
+errors_total = registry.counter(
+    'sudoku_errors_total', 'Failed requests by error type.', ('type',),
+)
+
+
+def observe_stages(timings: Dict[str, float], prefix: str = '') -> None:
+    """Record a {stage: seconds} dict in the stage histogram."""
+    for stage, seconds in timings.items():
+        stage_duration.observe(seconds, stage=prefix + stage)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that counts and times HTTP requests per route template
+    (e.g. /api/solve/), tracks requests in flight and counts unhandled
+    exceptions in sudoku_errors_total by exception class.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: Sequence[str] = ()):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['path'] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        requests_in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            errors_total.inc(type=type(e).__name__)
+            raise
+        finally:
+            requests_in_flight.dec()
+            # The router has filled in the matched route by now
+            endpoint = _endpoint(scope)
+            requests_total.inc(method=scope['method'], endpoint=endpoint, status=str(status))
+            request_duration.observe(
+                time.perf_counter() - start, method=scope['method'], endpoint=endpoint
+            )
+
+
+def _endpoint(scope: Scope) -> str:
+    """Route template of a handled request, 'unmatched' for unknown paths."""
+    route = scope.get('route')
+    path = getattr(route, 'path', None)
+    return path if path is not None else 'unmatched'
@@ -0,0 +1,66 @@
+"""
+Bounded reading of uploaded files.
+"""
+from typing import AsyncIterator
+
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.requests import Request
+
+# Bytes copied from the spooled upload at a time
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the size limit."""
+
+
+async def read_upload(request: Request, max_bytes: int, field: str = "file") -> bytes:
+    """
+    Read an uploaded file into memory: the `field` part of a
+    multipart/form-data request, or the raw body for any other content type.
+
+    The body is streamed and the read stops with UploadTooLarge as soon as
+    more than max_bytes of file data (plus multipart framing) arrive; a
+    declared Content-Length over the limit is rejected before reading.
+    Raises ValueError for malformed forms and forms without the file.
+    """
+    content_type = request.headers.get("content-type", "")
+    multipart = content_type.startswith("multipart/form-data")
+    limit = max_bytes + MULTIPART_OVERHEAD if multipart else max_bytes
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise UploadTooLarge(f"Upload larger than {max_bytes} bytes")
+
+    async def bounded() -> AsyncIterator[bytes]:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise UploadTooLarge(f"Upload larger than {max_bytes} bytes")
+            yield chunk
+
+    buffer = bytearray()
+    if not multipart:
+        async for chunk in bounded():
+            buffer += chunk
+        return bytes(buffer)
+
+    try:
+        form = await MultiPartParser(request.headers, bounded(), max_files=1, max_fields=16).parse()
+    except MultiPartException as e:
+        raise ValueError(e.message)
+    try:
+        upload = form.get(field)
+        if not isinstance(upload, UploadFile):
+            raise ValueError(f"Missing file field '{field}'")
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                raise UploadTooLarge(f"Upload larger than {max_bytes} bytes")
+        return bytes(buffer)
+    finally:
+        await form.close()
@@ -0,0 +1,193 @@
+"""
+Process pool for the CPU-bound solver and generator work of the API.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+
+class WorkerPoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class WorkerPool:
+    """
+    Runs pure-Python CPU work in worker processes so concurrent requests use
+    every core instead of serializing on the GIL. At most max_workers tasks
+    run at once and max_queue more may wait; further requests are rejected
+    with WorkerPoolSaturated. With max_workers=0 tasks run in the event
+    loop's threadpool instead (no extra processes).
+
+    A slot is held until its task has really finished, not just until its
+    caller stopped waiting, so tasks that outlive a timeout still count
+    against the limit.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.capacity = max(max_workers, 1) + max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Guards the counters (slots are released from executor threads)
+        self._lock = threading.Lock()
+        # Serializes _restart() so one broken pool is replaced only once
+        self._restart_lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def start(self) -> None:
+        """Create the process pool (workers are spawned on first use)."""
+        if self.max_workers > 0 and self._executor is None:
+            # spawn: forking a process that already runs threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling queued tasks."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in a worker and await the result.
+        Raises WorkerPoolSaturated when the queue is full and
+        asyncio.TimeoutError when the result is not ready within timeout
+        (a task that has not started yet is cancelled; a running one keeps
+        its slot until it returns).
+        """
+        self.reserve()
+        executor = self._executor
+        try:
+            if executor is None:
+                task = asyncio.ensure_future(run_in_threadpool(fn, *args))
+            else:
+                task = executor.submit(fn, *args)
+        except BaseException:
+            self.release()
+            raise
+        task.add_done_callback(lambda _: self.release())
+
+        try:
+            if executor is None:
+                # The thread cannot be stopped: stop waiting, keep the task
+                future = asyncio.shield(task)
+            else:
+                future = asyncio.wrap_future(task)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+    def reserve(self) -> None:
+        """Take a request slot, raising WorkerPoolSaturated if none is free."""
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise WorkerPoolSaturated("All workers are busy")
+            self._pending += 1
+
+    def check(self) -> None:
+        """
+        Raise WorkerPoolSaturated, counted as a rejection, if reserve()
+        would fail right now. Takes no slot.
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise WorkerPoolSaturated("All workers are busy")
+
+    def release(self) -> None:
+        """Give back a slot taken with reserve()."""
+        with self._lock:
+            self._pending -= 1
+
+    async def map_unordered(self, fn: Callable, chunks: List[Any], *args: Any) -> AsyncIterator[Any]:
+        """
+        Run fn(chunk, *args) for every chunk, yielding results as they complete.
+        At most one chunk per worker is in flight, so a large batch does not
+        lock out other requests. The caller must hold a slot from reserve().
+        """
+        pending = set()
+        remaining = iter(chunks)
+        concurrency = max(self.max_workers, 1)
+        executor = self._executor
+
+        def submit(chunk):
+            if executor is None:
+                return asyncio.ensure_future(run_in_threadpool(fn, chunk, *args))
+            return asyncio.wrap_future(executor.submit(fn, chunk, *args))
+
+        try:
+            for chunk in remaining:
+                pending.add(submit(chunk))
+                if len(pending) >= concurrency:
+                    break
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    next_chunk = next(remaining, None)
+                    if next_chunk is not None:
+                        pending.add(submit(next_chunk))
+                    yield future.result()
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+        finally:
+            # Client went away or a task failed: drop work that has not started
+            for future in pending:
+                future.cancel()
+
+    def call(self, fn: Callable, *args: Any) -> Any:
+        """
+        Blocking variant of run() for background threads. It takes a slot
+        like run(), so background work such as pool refills raises
+        WorkerPoolSaturated instead of exceeding the capacity when requests
+        already fill the pool.
+        """
+        self.reserve()
+        executor = self._executor
+        try:
+            if executor is None:
+                return fn(*args)
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+        finally:
+            self.release()
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Replace a pool whose worker died (e.g. killed for memory). Every
+        caller that saw broken fail asks for a restart; only the first
+        replaces it, so a fresh pool and its tasks are never shut down.
+        """
+        with self._restart_lock:
+            if self._executor is not broken:
+                return
+            self.shutdown()
+            self.start()
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size, current load and rejection counters."""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'capacity': self.capacity,
+                'pending': self._pending,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+            }
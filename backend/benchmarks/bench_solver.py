@@ -0,0 +1,104 @@
+"""
+Solver benchmark: bitmask SudokuSolver vs. the previous scan-based solver.
+
+Run from the backend directory:
+    python -m benchmarks.bench_solver
+"""
+import argparse
+import time
+from typing import Callable, List, Optional, Tuple
+
+from sudoku.solver import SudokuSolver
+from .corpus import PUZZLES, to_grid
+
+
+class ScanSolver:
+    """
+    Reference copy of the previous solver: every candidate check rescans the
+    row, column and box. Kept only as a baseline for the benchmark.
+    """
+
+    def __init__(self, grid: List[List[int]]):
+        self.grid = [row[:] for row in grid]
+
+    def is_valid(self, row: int, col: int, num: int) -> bool:
+        for c in range(9):
+            if self.grid[row][c] == num:
+                return False
+        for r in range(9):
+            if self.grid[r][col] == num:
+                return False
+        box_row = (row // 3) * 3
+        box_col = (col // 3) * 3
+        for r in range(box_row, box_row + 3):
+            for c in range(box_col, box_col + 3):
+                if self.grid[r][c] == num:
+                    return False
+        return True
+
+    def get_candidates(self, row: int, col: int) -> List[int]:
+        return [num for num in range(1, 10) if self.is_valid(row, col, num)]
+
+    def find_mrv_cell(self) -> Tuple[Optional[Tuple[int, int]], bool]:
+        min_candidates = 10
+        best_cell = None
+        for row in range(9):
+            for col in range(9):
+                if self.grid[row][col] == 0:
+                    count = len(self.get_candidates(row, col))
+                    if count == 0:
+                        return None, False
+                    if count < min_candidates:
+                        min_candidates = count
+                        best_cell = (row, col)
+        return best_cell, True
+
+    def solve(self) -> bool:
+        cell, alive = self.find_mrv_cell()
+        if not alive:
+            return False
+        if cell is None:
+            return True
+        row, col = cell
+        for num in self.get_candidates(row, col):
+            self.grid[row][col] = num
+            if self.solve():
+                return True
+            self.grid[row][col] = 0
+        return False
+
+    def get_solution(self) -> Optional[List[List[int]]]:
+        return self.grid if self.solve() else None
+
+
+def time_solver(factory: Callable, grid: List[List[int]], repeat: int) -> float:
+    """Best-of-repeat wall time of factory(grid).get_solution() in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solution = factory(grid).get_solution()
+        best = min(best, time.perf_counter() - start)
+        if solution is None:
+            raise RuntimeError('benchmark puzzle has no solution')
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per puzzle (best is kept)')
+    # The scan solver needs minutes on the 17-clue set, so it is opt-in
+    parser.add_argument('--categories', nargs='*',
+                        default=[c for c in PUZZLES if c != '17_clue'],
+                        help='corpus categories to run')
+    args = parser.parse_args()
+
+    print(f"{'category':<12}{'scan (ms)':>12}{'bitmask (ms)':>14}{'speedup':>10}")
+    for category in args.categories:
+        grids = [to_grid(p) for p in PUZZLES[category]]
+        scan = sum(time_solver(ScanSolver, g, args.repeat) for g in grids)
+        bitmask = sum(time_solver(SudokuSolver, g, args.repeat) for g in grids)
+        print(f"{category:<12}{scan * 1000:>12.1f}{bitmask * 1000:>14.1f}{scan / bitmask:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Standard puzzle corpora for the benchmarks, in 81-character notation ('.' = empty).
+"""
+from typing import Dict, List
+
+PUZZLES: Dict[str, List[str]] = {
+    'easy': [
+        '71.24963..985..7.2.4........3.4865.7.627.....8.7.1...6.7..6.2855..92.364326.54..9',
+        '.3.1.5...1...842.9.4...7.616..54.7..45.7..69..9863.5..3.2956.7.....1.93...6.7.82.',
+        '.2.3.7..5.1....7.95...6.3.18.2..5173.618.35.2.54.2..9.6..1..25.14.98.6.72.857.914',
+        '1..73.25.6..184937.73.5.14..964.371..15......42.5....9.4.3....2...2.85612.8.....3',
+    ],
+    'medium': [
+        '.89.61.53.257..918.318...72..4..78.129......7..8.4........8..9...2..3.86..6....3.',
+        '...7...6..2..65.....78..9.....95.2.8..4..1..9..12.....7..498..24.2.....6.8..1..47',
+        '...74...2798....51..358...............51..27..793265.......5...9.627..1.357.1..29',
+        '..25841.98.61973....1...74.26..49.....5....944.....28...4.....19....24.66...7..5.',
+    ],
+    'hard': [
+        '.42....1.5....6..8........5...84.....9.2.35..4....7..16..3.........7.23....598...',
+        '1...5..6..4.........2.1.7......7..4.5..4.62..71.3......3....6.14.9..7..2.5....4..',
+        '6..29..4.7.8.3............9.31...4......5...1584..2...4..5...96.6..........6.31.2',
+        '....7.8..81..4..6.723.............32..9...6.....51...9..4......3..7....4...32..97',
+    ],
+    'expert': [
+        '3....6....8.1....6.....3...........2..92..8..1.6.....48.7.9.5......2..7.4...5....',
+        '...6..9...9..18.2.12..3.......79..8..4....6......8.4.3...2....6......3.56.9.73...',
+        '.......388..1.2...5.9......1.5............7.57....3..2.1....9.....96.....3..1827.',
+        '.1.5.48.36.......4.5...61...8..3...1...2.7..6...4.172...5...........8...831...9..',
+    ],
+    # Well-known hard puzzles (Inkala, AI Escargot, Easter Monster, ...)
+    'known_hard': [
+        '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+        '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..',
+        '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1',
+        '.2.4.37.........32........4.4.2...7.8...5.........1...5.....9...3.9....7..1..86..',
+    ],
+    # Minimal 17-clue puzzles
+    '17_clue': [
+        '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+        '.......1.4.........2...........5.4.7..8...3....1.9....3..4..2...5.1........8.6...',
+        '.......12....35......6...7.7.....3.....4..8..1...........12.....8.....4..5....6..',
+        '..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9',
+        '...8.1..........435............7.8........1...2..3....6......75..34........2..6..',
+    ],
+}
+
+
+def to_grid(puzzle: str) -> List[List[int]]:
+    """Convert 81-character notation to a 9x9 grid."""
+    cells = [int(ch) if ch.isdigit() else 0 for ch in puzzle]
+    return [cells[row * 9:row * 9 + 9] for row in range(9)]
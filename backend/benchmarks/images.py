@@ -0,0 +1,64 @@
+"""
+Synthetic photos of printed Sudoku grids for the OCR benchmarks.
+"""
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+FONTS = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+]
+
+
+def render_puzzle(puzzle: str, grid_size: int = 900, canvas: Tuple[int, int] = (1200, 1000),
+                  angle: float = 0.0, font: int = cv2.FONT_HERSHEY_SIMPLEX,
+                  noise: float = 0.0, seed: int = 0) -> np.ndarray:
+    """
+    BGR image (canvas = (height, width)) of a puzzle in 81-character notation
+    printed as a grid_size square with thick box lines, centred on a grey
+    background, rotated by angle degrees and with Gaussian pixel noise.
+    """
+    grid = np.full((grid_size, grid_size), 255, dtype=np.uint8)
+    cell = grid_size / 9
+    for k in range(10):
+        thickness = 4 if k % 3 == 0 else 1
+        p = min(int(round(k * cell)), grid_size - 1)
+        cv2.line(grid, (p, 0), (p, grid_size - 1), 0, thickness)
+        cv2.line(grid, (0, p), (grid_size - 1, p), 0, thickness)
+
+    scale = cell / 40
+    stroke = max(2, int(cell / 25))
+    for index, ch in enumerate(puzzle):
+        if ch in '.0':
+            continue
+        row, col = divmod(index, 9)
+        (width, height), _ = cv2.getTextSize(ch, font, scale, stroke)
+        x = int(col * cell + (cell - width) / 2)
+        y = int(row * cell + (cell + height) / 2)
+        cv2.putText(grid, ch, (x, y), font, scale, 0, stroke, cv2.LINE_AA)
+
+    height, width = canvas
+    image = np.full((height, width), 235, dtype=np.uint8)
+    y0 = (height - grid_size) // 2
+    x0 = (width - grid_size) // 2
+    image[y0:y0 + grid_size, x0:x0 + grid_size] = grid
+
+    if angle:
+        rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        image = cv2.warpAffine(image, rotation, (width, height), borderValue=235)
+    if noise:
+        rng = np.random.default_rng(seed)
+        image = np.clip(image + rng.normal(0, noise, image.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 90) -> bytes:
+    """JPEG bytes of an image, as a phone camera would upload them."""
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError('JPEG encoding failed')
+    return buffer.tobytes()
@@ -0,0 +1,397 @@
+"""
+Benchmark suite for the solver, the generator, the vectorized grid checks,
+16x16 and 25x25 grids and the OCR pipeline.
+
+Every case is run repeatedly and reported as p50/p95/p99 latency, search
+nodes (solver branches) where they apply, per-phase generation times
+(SudokuGenerator.timings), and peak Python heap (tracemalloc,
+measured in a separate untimed pass). Results are written as JSON; with
+--baseline the run fails (exit status 1) when a case's score or node count
+exceeds the baseline by more than --threshold, or OCR reads more cells
+wrong. The score is the mean over inputs of each input's best time, which
+is far less noisy than percentiles of a handful of mixed-cost inputs; for
+generation, where every sample differs, it is the mean time of the seeded
+sample sequence.
+
+Run from the backend directory:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --sections solve generate
+    python -m benchmarks.suite --sections validate --validate-grids 1000000
+    python -m benchmarks.suite --sections sizes --sizes 16 --size-budget 30
+    python -m benchmarks.suite --save-baseline    # refresh benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from sudoku.engines import DEFAULT_ENGINE, SOLVER_ENGINES, create_solver
+from sudoku.generator import SudokuGenerator
+from .corpus import PUZZLES, to_grid
+
+SECTIONS = ('solve', 'generate', 'validate', 'sizes', 'ocr')
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Default results file; gitignored, unlike the baseline
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results.json')
+
+# Generation methods (SudokuGenerator method names)
+GENERATE_METHODS = {
+    'search': 'generate',
+    'graded': 'generate_graded',
+    'seeds': 'generate_from_seeds',
+}
+
+# OCR image sizes: (grid side, (canvas height, canvas width)) in pixels
+OCR_SIZES = {
+    'scan': (900, (1200, 1000)),
+    '12mp': (2700, (3000, 4000)),
+}
+
+# Latency increases smaller than this are noise, whatever the ratio
+MIN_DELTA_MS = 0.1
+
+Case = Dict[str, object]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """q-th percentile (0-100) of samples, linearly interpolated."""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(samples: List[float], best: Optional[List[float]] = None) -> Case:
+    """
+    Latency summary in milliseconds of samples in seconds; best holds the
+    best time of each input (the samples themselves if not given).
+    """
+    best = samples if best is None else best
+    return {
+        'runs': len(samples),
+        'score_ms': 1000 * sum(best) / len(best),
+        'mean_ms': 1000 * sum(samples) / len(samples),
+        'p50_ms': 1000 * percentile(samples, 50),
+        'p95_ms': 1000 * percentile(samples, 95),
+        'p99_ms': 1000 * percentile(samples, 99),
+    }
+
+
+def peak_kib(fn: Callable[[], object]) -> float:
+    """Peak traced heap allocation of fn() in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_solve(engine: str, categories: List[str], repeat: int) -> Dict[str, Case]:
+    """Solve every corpus puzzle repeat times per category."""
+    cases = {}
+    for category in categories:
+        grids = [to_grid(p) for p in PUZZLES[category]]
+        samples = []
+        best = []
+        nodes = []
+        for grid in grids:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                solver = create_solver(grid, engine)
+                if not solver.solve():
+                    raise RuntimeError(f'{category} benchmark puzzle has no solution')
+                times.append(time.perf_counter() - start)
+            samples.extend(times)
+            best.append(min(times))
+            nodes.append(getattr(solver, 'branches', 0))
+
+        case = summarize(samples, best)
+        case['nodes'] = sum(nodes) / len(nodes)
+        case['peak_kib'] = peak_kib(lambda: [create_solver(g, engine).solve() for g in grids])
+        cases[f'solve/{engine}/{category}'] = case
+    return cases
+
+
+def bench_generate(methods: List[str], samples: int, seed: int) -> Dict[str, Case]:
+    """Generate samples puzzles per method and difficulty from a fixed random seed."""
+    generator = SudokuGenerator()
+    cases = {}
+    for method in methods:
+        generate = getattr(generator, GENERATE_METHODS[method])
+        for difficulty in SudokuGenerator.DIFFICULTY_SETTINGS:
+            generate(difficulty)  # Warm-up: loads the seed library
+            random.seed(seed)
+            timings = []
+            phases: Dict[str, float] = {}
+            for _ in range(samples):
+                start = time.perf_counter()
+                generate(difficulty)
+                timings.append(time.perf_counter() - start)
+                for phase, value in generator.timings.items():
+                    phases[phase] = phases.get(phase, 0) + value
+
+            case = summarize(timings)
+            # Mean per puzzle; seconds as ms, counts as they are
+            case['phases'] = {
+                phase: (1000 * total if isinstance(generator.timings[phase], float) else total)
+                / samples
+                for phase, total in phases.items()
+            }
+            random.seed(seed)
+            case['peak_kib'] = peak_kib(lambda: generate(difficulty))
+            cases[f'generate/{method}/{difficulty}'] = case
+    return cases
+
+
+def bench_validate(count: int, repeat: int) -> Dict[str, Case]:
+    """
+    Check count grids (the corpus puzzles, repeated) in one call of each
+    sudoku.vectorized check; nodes are not measured.
+    """
+    from sudoku.vectorized import analyze, find_conflicts, to_array
+
+    puzzles = [p for category in PUZZLES.values() for p in category]
+    grids = to_array(puzzles * (count // len(puzzles) + 1))[:count]
+    cases = {}
+    for name, check in (('conflicts', find_conflicts), ('analyze', analyze)):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            check(grids)
+            samples.append(time.perf_counter() - start)
+        case = summarize(samples, [min(samples)])
+        case['grids_per_s'] = count / min(samples)
+        case['peak_kib'] = peak_kib(lambda: check(grids))
+        cases[f'validate/{name}/{count}'] = case
+    return cases
+
+
+def bench_sizes(sizes: List[int], engine: str, samples: int, budget: float,
+                repeat: int, seed: int) -> Dict[str, Case]:
+    """
+    Generate samples medium puzzles per grid size by search, each within
+    budget seconds, from a fixed random seed, then solve each of them repeat
+    times. Generation cases also report the mean clue count, which shows
+    how far the budget let clue removal go; cut-short removal depends on
+    the machine's speed, so the puzzles (and solve cases) may differ
+    between machines.
+    """
+    cases = {}
+    for size in sizes:
+        generator = SudokuGenerator(engine, size)
+        generator.time_budget = budget
+        random.seed(seed)
+        puzzles = []
+        timings = []
+        phases: Dict[str, float] = {}
+        for _ in range(samples):
+            start = time.perf_counter()
+            puzzle, _ = generator.generate('medium')
+            timings.append(time.perf_counter() - start)
+            puzzles.append(puzzle)
+            for phase, value in generator.timings.items():
+                phases[phase] = phases.get(phase, 0) + value
+
+        case = summarize(timings)
+        case['phases'] = {
+            phase: (1000 * total if isinstance(generator.timings[phase], float) else total)
+            / samples
+            for phase, total in phases.items()
+        }
+        case['clues'] = sum(sum(1 for row in p for num in row if num) for p in puzzles) / samples
+        random.seed(seed)
+        case['peak_kib'] = peak_kib(lambda: generator.generate('medium'))
+        cases[f'sizes/generate/{size}x{size}'] = case
+
+        solve_samples = []
+        best = []
+        nodes = []
+        for puzzle in puzzles:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                solver = create_solver(puzzle, engine)
+                if not solver.solve():
+                    raise RuntimeError(f'{size}x{size} benchmark puzzle has no solution')
+                times.append(time.perf_counter() - start)
+            solve_samples.extend(times)
+            best.append(min(times))
+            nodes.append(getattr(solver, 'branches', 0))
+
+        case = summarize(solve_samples, best)
+        case['nodes'] = sum(nodes) / len(nodes)
+        case['peak_kib'] = peak_kib(lambda: [create_solver(p, engine).solve() for p in puzzles])
+        cases[f'sizes/solve/{engine}/{size}x{size}'] = case
+    return cases
+
+
+def bench_ocr(engine: str, sizes: List[str], repeat: int) -> Dict[str, Case]:
+    """
+    Read rendered JPEG photos of the corpus puzzles (every category, varying
+    font, tilt and noise) through SudokuOCR.read_image_bytes().
+    """
+    from ocr.image_processor import SudokuOCR
+    from .images import FONTS, encode_jpeg, render_puzzle
+
+    ocr = SudokuOCR(engine=engine, tesseract_fallback=False)
+    puzzles = [p for category in PUZZLES.values() for p in category]
+    cases = {}
+    for size in sizes:
+        grid_size, canvas = OCR_SIZES[size]
+        images = [
+            encode_jpeg(render_puzzle(p, grid_size, canvas, angle=(k * 3) % 7 - 3,
+                                      font=FONTS[k % len(FONTS)], noise=6, seed=k))
+            for k, p in enumerate(puzzles)
+        ]
+
+        samples = []
+        best = []
+        stages: Dict[str, List[float]] = {}
+        errors = 0
+        for puzzle, image in zip(puzzles, images):
+            times = []
+            for run in range(repeat):
+                start = time.perf_counter()
+                result = ocr.read_image_bytes(image)
+                times.append(time.perf_counter() - start)
+                if result is None:
+                    errors += 81 if run == 0 else 0
+                    continue
+                for stage, seconds in result['timings'].items():
+                    stages.setdefault(stage, []).append(seconds)
+                if run == 0:
+                    read = ''.join(str(num) for row in result['grid'] for num in row)
+                    errors += sum(a != b for a, b in zip(puzzle.replace('.', '0'), read))
+            samples.extend(times)
+            best.append(min(times))
+
+        case = summarize(samples, best)
+        case['cell_errors'] = errors
+        case['cells'] = 81 * len(puzzles)
+        case['stages_p50_ms'] = {
+            stage: 1000 * percentile(seconds, 50) for stage, seconds in stages.items()
+        }
+        case['peak_kib'] = peak_kib(lambda: ocr.read_image_bytes(images[0]))
+        cases[f'ocr/{engine}/{size}'] = case
+    return cases
+
+
+def compare(cases: Dict[str, Case], baseline: Dict[str, Case], threshold: float) -> List[str]:
+    """Regressions of cases against baseline cases, as readable lines."""
+    regressions = []
+    for name, case in cases.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if (case['score_ms'] > base['score_ms'] * (1 + threshold)
+                and case['score_ms'] - base['score_ms'] > MIN_DELTA_MS):
+            regressions.append(
+                f"{name}: score {case['score_ms']:.2f} ms vs baseline {base['score_ms']:.2f} ms"
+            )
+        if 'nodes' in base and case['nodes'] > base['nodes'] * (1 + threshold):
+            regressions.append(f"{name}: {case['nodes']:.0f} nodes vs baseline {base['nodes']:.0f}")
+        if 'cell_errors' in base and case['cell_errors'] > base['cell_errors']:
+            regressions.append(
+                f"{name}: {case['cell_errors']} cell errors vs baseline {base['cell_errors']}"
+            )
+    return regressions
+
+
+def print_table(cases: Dict[str, Case]) -> None:
+    print(f"{'case':<32}{'score ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'nodes':>9}{'peak KiB':>10}")
+    for name, case in cases.items():
+        nodes = f"{case['nodes']:.0f}" if 'nodes' in case else '-'
+        print(f"{name:<32}{case['score_ms']:>10.2f}{case['p50_ms']:>10.2f}{case['p95_ms']:>10.2f}{case['p99_ms']:>10.2f}"
+              f"{nodes:>9}{case['peak_kib']:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sections', nargs='*', default=list(SECTIONS), choices=SECTIONS,
+                        help='parts of the suite to run')
+    parser.add_argument('--engine', default=DEFAULT_ENGINE, choices=list(SOLVER_ENGINES),
+                        help='solver engine for the solve cases')
+    parser.add_argument('--categories', nargs='*', default=list(PUZZLES),
+                        help='corpus categories for the solve cases')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per puzzle or image')
+    parser.add_argument('--methods', nargs='*', default=['search', 'seeds'],
+                        choices=list(GENERATE_METHODS), help='generation methods')
+    parser.add_argument('--samples', type=int, default=10,
+                        help='puzzles generated per method and difficulty')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for generation')
+    parser.add_argument('--validate-grids', type=int, default=100000,
+                        help='grids per call for the validate cases')
+    parser.add_argument('--sizes', nargs='*', type=int, default=[16, 25], choices=[9, 16, 25],
+                        help='grid sizes for the sizes cases')
+    parser.add_argument('--size-samples', type=int, default=3,
+                        help='puzzles generated and solved per grid size')
+    parser.add_argument('--size-budget', type=float, default=10,
+                        help='seconds allowed per generated puzzle in the sizes cases')
+    parser.add_argument('--ocr-engine', default='template', help='digit recognizer for OCR')
+    parser.add_argument('--ocr-sizes', nargs='*', default=list(OCR_SIZES), choices=list(OCR_SIZES),
+                        help='image sizes for the OCR cases')
+    parser.add_argument('--output', default=RESULTS_PATH, help='JSON results file')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='results file to compare with (skipped if missing)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown / extra nodes as a fraction of the baseline')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write the results to --baseline instead of comparing')
+    args = parser.parse_args()
+
+    cases: Dict[str, Case] = {}
+    if 'solve' in args.sections:
+        cases.update(bench_solve(args.engine, args.categories, args.repeat))
+    if 'generate' in args.sections:
+        cases.update(bench_generate(args.methods, args.samples, args.seed))
+    if 'validate' in args.sections:
+        cases.update(bench_validate(args.validate_grids, args.repeat))
+    if 'sizes' in args.sections:
+        cases.update(bench_sizes(args.sizes, args.engine, args.size_samples, args.size_budget,
+                                 args.repeat, args.seed))
+    if 'ocr' in args.sections:
+        cases.update(bench_ocr(args.ocr_engine, args.ocr_sizes, args.repeat))
+    print_table(cases)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'baseline')},
+        },
+        'cases': cases,
+    }
+    with open(args.baseline if args.save_baseline else args.output, 'w') as f:
+        json.dump(results, f, indent=1)
+        f.write('\n')
+    if args.save_baseline:
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    baseline: Optional[Dict] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; results written to {args.output}")
+        return
+
+    regressions = compare(cases, baseline['cases'], args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regressions against {args.baseline} "
+          f"(threshold {args.threshold:.0%}); results written to {args.output}")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,28 @@
-from .image_processor import SudokuOCR
+"""
+OCR of photographed Sudoku grids.
 
-__all__ = ['SudokuOCR']
+The names below are imported on first access, so importing ocr (or the
+dependency-free ocr.repair) does not load OpenCV and NumPy.
+"""
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'SudokuOCR': 'image_processor',
+    'OCR_ENGINES': 'recognizers',
+    'DEFAULT_OCR_ENGINE': 'recognizers',
+    'DigitRecognizer': 'recognizers',
+    'TesseractRecognizer': 'recognizers',
+    'TemplateRecognizer': 'recognizers',
+    'create_recognizer': 'recognizers',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,168 @@
+"""
+Content-addressed cache of OCR reads.
+
+Uploads of the same picture are common (retries, shared puzzle images), so
+SudokuOCR can keep its reads in an OCRCache with two levels:
+
+- 'bytes': keyed by a hash of the uploaded file; a hit skips everything,
+  decoding included.
+- 'image': keyed by a hash of the thresholded 450x450 grid image, the exact
+  input of digit recognition. A file that differs only in metadata or
+  container (EXIF stripped, PNG re-saved, lossless conversion) decodes to
+  the same grid image and skips recognition. The key is exact on purpose:
+  coarser image hashes also match grids that differ in a single digit.
+
+Reads are stored as compact JSON, so the memory reported by stats() is the
+actual payload, and copies handed out can be modified freely. With a path,
+save() and load() keep the entries across restarts.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+LEVELS = ('bytes', 'image')
+# Bump when the stored read format changes; files of other versions are ignored
+FORMAT_VERSION = 1
+
+
+class OCRCache:
+    """
+    Two LRU maps (one per level) of up to max_size reads each. Safe to
+    share between threads.
+    """
+
+    def __init__(self, max_size: int = 1024, path: Optional[str] = None):
+        self.max_size = max_size
+        self.path = path
+        self._entries: Dict[str, 'OrderedDict[str, bytes]'] = {level: OrderedDict() for level in LEVELS}
+        self._memory = {level: 0 for level in LEVELS}
+        self._lock = threading.Lock()
+        self.hits = {level: 0 for level in LEVELS}
+        self.misses = {level: 0 for level in LEVELS}
+        self.evictions = {level: 0 for level in LEVELS}
+
+    @staticmethod
+    def key(*parts: bytes) -> str:
+        """Hash of the concatenated parts (settings first, then the content)."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get(self, level: str, key: str) -> Optional[Dict]:
+        """A fresh copy of the read stored under key, or None."""
+        with self._lock:
+            payload = self._entries[level].get(key)
+            if payload is None:
+                self.misses[level] += 1
+                return None
+            self._entries[level].move_to_end(key)
+            self.hits[level] += 1
+        return json.loads(payload)
+
+    def put(self, level: str, key: str, value: Dict) -> None:
+        """Store a read (any JSON-serializable dict) under key."""
+        if self.max_size <= 0:
+            return
+        payload = json.dumps(value, separators=(',', ':')).encode()
+        with self._lock:
+            self._insert(level, key, payload)
+            entries = self._entries[level]
+            while len(entries) > self.max_size:
+                old_key, old_payload = entries.popitem(last=False)
+                self._memory[level] -= len(old_key) + len(old_payload)
+                self.evictions[level] += 1
+
+    def _insert(self, level: str, key: str, payload: bytes) -> None:
+        entries = self._entries[level]
+        previous = entries.get(key)
+        if previous is not None:
+            self._memory[level] -= len(key) + len(previous)
+        entries[key] = payload
+        entries.move_to_end(key)
+        self._memory[level] += len(key) + len(payload)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            for level in LEVELS:
+                self._entries[level].clear()
+                self._memory[level] = 0
+
+    def save(self) -> None:
+        """Write the entries to path (no-op without one), replacing the file atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'version': FORMAT_VERSION,
+                'levels': {
+                    level: [[key, payload.decode()] for key, payload in self._entries[level].items()]
+                    for level in LEVELS
+                },
+            }
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temporary, self.path)
+
+    def load(self) -> int:
+        """
+        Add the entries saved at path, keeping the most recent max_size per
+        level. Returns the number loaded; a missing, unreadable or outdated
+        file loads nothing.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"OCR cache not loaded: {e}")
+            return 0
+        if data.get('version') != FORMAT_VERSION:
+            return 0
+
+        loaded = 0
+        with self._lock:
+            for level in LEVELS:
+                items = data['levels'].get(level, [])
+                for key, payload in items[max(0, len(items) - self.max_size):]:
+                    self._insert(level, key, payload.encode())
+                    loaded += 1
+                entries = self._entries[level]
+                while len(entries) > self.max_size:
+                    old_key, old_payload = entries.popitem(last=False)
+                    self._memory[level] -= len(old_key) + len(old_payload)
+        return loaded
+
+    def stats(self) -> Dict:
+        """
+        Per-level size, hits, misses, hit rate, evictions and memory (bytes
+        of keys and stored reads), plus the share of reads answered by
+        either level.
+        """
+        with self._lock:
+            levels = {}
+            for level in LEVELS:
+                lookups = self.hits[level] + self.misses[level]
+                levels[level] = {
+                    'size': len(self._entries[level]),
+                    'hits': self.hits[level],
+                    'misses': self.misses[level],
+                    'hit_rate': round(self.hits[level] / lookups, 4) if lookups else None,
+                    'evictions': self.evictions[level],
+                    'memory_bytes': self._memory[level],
+                }
+            # Every read looks up 'bytes' first; 'image' only sees its misses
+            reads = self.hits['bytes'] + self.misses['bytes']
+            hits = self.hits['bytes'] + self.hits['image']
+            return {
+                'max_size': self.max_size,
+                'hit_rate': round(hits / reads, 4) if reads else None,
+                'memory_bytes': sum(self._memory.values()),
+                'levels': levels,
+            }
@@ -1,26 +1,82 @@
 """
 Image processing and OCR for Sudoku puzzles.
 """
+import io
+import time
+
 import cv2
 import numpy as np
-from typing import List, Optional, Tuple
-import pytesseract
-from PIL import Image
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .cache import OCRCache
+from .recognizers import DEFAULT_OCR_ENGINE, TesseractRecognizer, create_recognizer
+
+# Fraction of the cell trimmed on each side before looking for a digit, so
+# grid lines at the cell border are not mistaken for ink
+CELL_MARGIN = 0.12
+# Cells with less ink than this fraction of the trimmed area are blank
+MIN_INK_RATIO = 0.03
+# A digit is a connected component at least this fraction of the trimmed
+# cell height, centred within this fraction of its width/height
+MIN_DIGIT_HEIGHT = 0.35
+MAX_CENTER_OFFSET = 0.3
+
+# Grid detection runs on a copy with at most this many pixels on its longest
+# side; a phone photo's contour is found just as well at a fraction of the cost
+DETECT_MAX_SIDE = 1000
+# Side of the warped grid image (9 cells of 50 pixels)
+GRID_SIZE = 450
+# Uploads are decoded at 1/2, 1/4 or 1/8 scale (JPEG decoders scale for almost
+# free) as long as the longest side stays at least this many pixels
+DECODE_MIN_SIDE = 1600
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
 
 
 class SudokuOCR:
     """Processes images of Sudoku puzzles and extracts the grid."""
     
-    def __init__(self):
-        self.tesseract_config = r'--oem 3 --psm 10 -c tessedit_char_whitelist=123456789'
+    def __init__(self, engine: str = DEFAULT_OCR_ENGINE, min_confidence: float = 0.6,
+                 tesseract_fallback: bool = True, use_montage: bool = True, max_workers: int = 4):
+        """
+        engine names the digit recognizer (see ocr.recognizers.OCR_ENGINES).
+        With another engine than Tesseract and tesseract_fallback, cells read
+        with less than min_confidence are re-read by Tesseract. use_montage
+        and max_workers configure Tesseract: all digits in one call on a
+        montage image, the ones it cannot resolve on up to max_workers threads.
+        """
+        tesseract_options = {'use_montage': use_montage, 'max_workers': max_workers}
+        self.recognizer = create_recognizer(
+            engine, **(tesseract_options if engine == 'tesseract' else {})
+        )
+        self.fallback = (
+            TesseractRecognizer(**tesseract_options)
+            if tesseract_fallback and not isinstance(self.recognizer, TesseractRecognizer) else None
+        )
+        self.min_confidence = min_confidence
+        # Optional OCRCache of reads, keyed by upload and by grid image
+        self.cache: Optional[OCRCache] = None
+    
+    def load(self) -> None:
+        """
+        Load the recognizer's model now instead of on the first read. A
+        loaded instance holds no per-image state and can be shared by
+        threads, so a server creates one and keeps it for its lifetime.
+        """
+        self.recognizer.load()
     
-    def preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess image: grayscale, thresholding, deskew."""
-        # Convert to grayscale if needed
+    def to_grayscale(self, image: np.ndarray) -> np.ndarray:
+        """Single-channel view of a BGR or grayscale image."""
         if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+    
+    def preprocess_image(self, image: np.ndarray) -> np.ndarray:
+        """Preprocess image: grayscale, blur, adaptive thresholding (ink = 255)."""
+        gray = self.to_grayscale(image)
         
         # Apply Gaussian blur
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
@@ -33,8 +89,11 @@ class SudokuOCR:
         
         return thresh
     
-    def find_grid(self, image: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
-        """Find the Sudoku grid in the image."""
+    def find_corners(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Corners of the Sudoku grid in a thresholded image, ordered top-left,
+        top-right, bottom-right, bottom-left; None if there is no contour.
+        """
         # Find contours
         contours, _ = cv2.findContours(image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
@@ -52,26 +111,47 @@ class SudokuOCR:
             # Try to find rectangular shape
             rect = cv2.minAreaRect(largest_contour)
             box = cv2.boxPoints(rect)
-            approx = np.int0(box)
+            approx = np.intp(box)
         
-        # Get corners
-        corners = self._order_points(approx.reshape(-1, 2))
+        return self._order_points(approx.reshape(-1, 2))
+    
+    def locate_grid(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Find the grid corners of a grayscale image of any size. The contour
+        search runs on a copy scaled down to DETECT_MAX_SIDE pixels, and the
+        corners are mapped back to full-resolution coordinates.
+        """
+        scale = min(1.0, DETECT_MAX_SIDE / max(gray.shape[:2]))
+        small = gray
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
         
-        # Perspective transform
-        width = 450
-        height = 450
+        corners = self.find_corners(self.preprocess_image(small))
+        if corners is None:
+            return None
+        return corners / scale
+    
+    def warp_grid(self, image: np.ndarray, corners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Warp the quadrilateral at corners to a GRID_SIZE square; returns (warped, M)."""
         dst = np.array([
             [0, 0],
-            [width - 1, 0],
-            [width - 1, height - 1],
-            [0, height - 1]
+            [GRID_SIZE - 1, 0],
+            [GRID_SIZE - 1, GRID_SIZE - 1],
+            [0, GRID_SIZE - 1]
         ], dtype='float32')
         
         M = cv2.getPerspectiveTransform(corners.astype('float32'), dst)
-        warped = cv2.warpPerspective(image, M, (width, height))
+        warped = cv2.warpPerspective(image, M, (GRID_SIZE, GRID_SIZE), flags=cv2.INTER_AREA)
         
         return warped, M
     
+    def find_grid(self, image: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Find the Sudoku grid in a thresholded image; returns (warped, M)."""
+        corners = self.find_corners(image)
+        if corners is None:
+            return None
+        return self.warp_grid(image, corners)
+    
     def _order_points(self, pts: np.ndarray) -> np.ndarray:
         """Order points: top-left, top-right, bottom-right, bottom-left."""
         rect = np.zeros((4, 2), dtype='float32')
@@ -100,105 +180,242 @@ class SudokuOCR:
                 x2 = int((col + 1) * cell_size)
                 
                 cell = grid_image[y1:y2, x1:x2]
-                # Add padding
-                cell = cv2.copyMakeBorder(cell, 5, 5, 5, 5, cv2.BORDER_CONSTANT, value=255)
+                # Add padding (0 is background in the inverted threshold image)
+                cell = cv2.copyMakeBorder(cell, 5, 5, 5, 5, cv2.BORDER_CONSTANT, value=0)
                 cell_row.append(cell)
             cells.append(cell_row)
         
         return cells
     
+    def extract_digit(self, cell_image: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Find the digit in a thresholded cell (ink = 255).
+        Returns the ink inside the digit's bounding box, or None for a blank
+        cell: too little ink, or no connected component big and central
+        enough to be a digit.
+        """
+        h, w = cell_image.shape[:2]
+        my, mx = int(h * CELL_MARGIN), int(w * CELL_MARGIN)
+        inner = cell_image[my:h - my, mx:w - mx]
+        ih, iw = inner.shape[:2]
+        
+        # Cheap ink test first; most blank cells stop here
+        if cv2.countNonZero(inner) < MIN_INK_RATIO * ih * iw:
+            return None
+        
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(inner, connectivity=8)
+        best = 0
+        best_area = 0
+        for label in range(1, count):
+            height = stats[label, cv2.CC_STAT_HEIGHT]
+            area = stats[label, cv2.CC_STAT_AREA]
+            cx, cy = centroids[label]
+            if (area > best_area and height >= MIN_DIGIT_HEIGHT * ih
+                    and abs(cx - iw / 2) <= MAX_CENTER_OFFSET * iw
+                    and abs(cy - ih / 2) <= MAX_CENTER_OFFSET * ih):
+                best, best_area = label, area
+        if not best:
+            return None
+        
+        x = stats[best, cv2.CC_STAT_LEFT]
+        y = stats[best, cv2.CC_STAT_TOP]
+        return inner[y:y + stats[best, cv2.CC_STAT_HEIGHT], x:x + stats[best, cv2.CC_STAT_WIDTH]]
+    
+    def recognize_cells(self, cells: List[List[np.ndarray]]) -> List[List[int]]:
+        """Recognize the 81 cells; returns the 9x9 grid (0 for empty cells)."""
+        return self.read_cells(cells)['grid']
+    
+    def read_cells(self, cells: List[List[np.ndarray]], top_k: int = 3) -> Dict:
+        """
+        Recognize the 81 cells. Blank cells are skipped up front; the digits
+        of the rest are recognized by the configured engine in one batch, and
+        cells it reads with less than min_confidence are re-read by the
+        Tesseract fallback (its answer is kept only if it reads a digit).
+        
+        Returns a dict with the 9x9 'grid', the 9x9 'confidence' of each read
+        and the 9x9 'alternatives': up to top_k (digit, confidence) pairs per
+        cell, best first. Blank cells read as [(0, 1.0)].
+        """
+        grid = [[0] * 9 for _ in range(9)]
+        confidence = [[1.0] * 9 for _ in range(9)]
+        alternatives = [[[(0, 1.0)] for _ in range(9)] for _ in range(9)]
+        positions = []
+        digits = []
+        for row in range(9):
+            for col in range(9):
+                digit = self.extract_digit(cells[row][col])
+                if digit is not None:
+                    positions.append((row, col))
+                    digits.append(digit)
+        
+        results = self.recognizer.recognize_top_k(digits, top_k)
+        
+        if self.fallback is not None:
+            uncertain = [k for k, ranked in enumerate(results) if ranked[0][1] < self.min_confidence]
+            if uncertain:
+                retried = self.fallback.recognize([digits[k] for k in uncertain])
+                for k, (value, _) in zip(uncertain, retried):
+                    if value:
+                        # Promote the fallback's digit, keeping the engine's odds for it
+                        odds = dict(results[k])
+                        ranked = [(value, max(odds.get(value, 0.0), self.min_confidence))]
+                        results[k] = ranked + [(d, p) for d, p in results[k] if d != value][:top_k - 1]
+        
+        for (row, col), ranked in zip(positions, results):
+            grid[row][col] = ranked[0][0]
+            confidence[row][col] = ranked[0][1]
+            alternatives[row][col] = ranked
+        return {'grid': grid, 'confidence': confidence, 'alternatives': alternatives}
+    
     def recognize_digit(self, cell_image: np.ndarray) -> int:
         """Recognize digit in a cell using Tesseract OCR."""
-        # Invert for Tesseract (expects dark text on light background)
-        cell_inv = cv2.bitwise_not(cell_image)
+        return self._tesseract().recognize_digit(cell_image)
+    
+    def _tesseract(self) -> TesseractRecognizer:
+        """The Tesseract recognizer in use (as engine or fallback)."""
+        if isinstance(self.recognizer, TesseractRecognizer):
+            return self.recognizer
+        if self.fallback is None:
+            self.fallback = TesseractRecognizer()
+        return self.fallback
+    
+    def run_pipeline(self, image: np.ndarray, top_k: int = 3) -> Optional[Dict]:
+        """
+        Read the grid from a decoded image: grayscale, locate the grid on a
+        downscaled copy, warp the full-resolution grayscale grid to
+        GRID_SIZE x GRID_SIZE, threshold only that, split and read the cells.
         
-        # Resize for better OCR
-        cell_resized = cv2.resize(cell_inv, (50, 50), interpolation=cv2.INTER_CUBIC)
+        Returns the read_cells() dict plus 'timings', the seconds spent in
+        each stage, or None if no grid was found.
+        """
+        timings = {}
+        clock = time.perf_counter()
         
-        # Convert to PIL Image
-        pil_image = Image.fromarray(cell_resized)
+        def lap(stage: str) -> None:
+            nonlocal clock
+            now = time.perf_counter()
+            timings[stage] = now - clock
+            clock = now
         
-        try:
-            text = pytesseract.image_to_string(pil_image, config=self.tesseract_config).strip()
-            if text and text.isdigit() and 1 <= int(text) <= 9:
-                return int(text)
-        except Exception:
-            pass
+        gray = self.to_grayscale(image)
+        lap('grayscale')
+        
+        corners = self.locate_grid(gray)
+        lap('locate')
+        if corners is None:
+            return None
+        
+        warped, _ = self.warp_grid(gray, corners)
+        lap('warp')
         
-        return 0
+        grid_image = self.preprocess_image(warped)
+        lap('threshold')
+        
+        # The thresholded grid is all recognition sees: same image, same read
+        if self.cache is not None:
+            image_key = self.cache.key(self._cache_settings(top_k), np.packbits(grid_image).tobytes())
+            result = self._cached('image', image_key)
+            if result is not None:
+                lap('cache')
+                result['timings'] = timings
+                return result
+        
+        cells = self.split_into_cells(grid_image)
+        result = self.read_cells(cells, top_k)
+        lap('recognize')
+        if self.cache is not None:
+            self.cache.put('image', image_key, result)
+        
+        result['timings'] = timings
+        return result
+    
+    def read_image(self, image_path: str, top_k: int = 3) -> Optional[Dict]:
+        """Like read_image_bytes, for an image file. Returns None if failed."""
+        return self._read(lambda: cv2.imread(image_path), top_k)
     
     def process_image(self, image_path: str) -> Optional[List[List[int]]]:
         """
         Process image and extract Sudoku grid.
         Returns 9x9 grid (0 for empty cells) or None if failed.
         """
-        try:
-            # Read image
-            image = cv2.imread(image_path)
-            if image is None:
-                return None
-            
-            # Preprocess
-            processed = self.preprocess_image(image)
-            
-            # Find grid
-            result = self.find_grid(processed)
-            if result is None:
-                return None
-            
-            grid_image, _ = result
-            
-            # Split into cells
-            cells = self.split_into_cells(grid_image)
-            
-            # OCR each cell
-            grid = []
-            for row in range(9):
-                grid_row = []
-                for col in range(9):
-                    digit = self.recognize_digit(cells[row][col])
-                    grid_row.append(digit)
-                grid.append(grid_row)
-            
-            return grid
-        
-        except Exception as e:
-            print(f"OCR Error: {e}")
-            return None
+        result = self.read_image(image_path)
+        return result['grid'] if result is not None else None
     
     def process_image_bytes(self, image_bytes: bytes) -> Optional[List[List[int]]]:
         """Process image from bytes (for API upload)."""
+        result = self.read_image_bytes(image_bytes)
+        return result['grid'] if result is not None else None
+    
+    def read_image_bytes(self, image_bytes: bytes, top_k: int = 3) -> Optional[Dict]:
+        """
+        Like process_image_bytes, but return the run_pipeline() dict with
+        per-cell confidence, alternatives and stage timings (including
+        'decode'). Returns None if failed.
+        
+        With a cache, a file read before is answered from it, with only
+        'cache' in the timings.
+        """
+        if self.cache is None:
+            return self._read(lambda: self.decode_image(image_bytes), top_k)
+        
+        start = time.perf_counter()
+        bytes_key = self.cache.key(self._cache_settings(top_k), image_bytes)
+        result = self._cached('bytes', bytes_key)
+        if result is not None:
+            result['timings'] = {'cache': time.perf_counter() - start}
+            return result
+        
+        result = self._read(lambda: self.decode_image(image_bytes), top_k)
+        if result is not None:
+            self.cache.put('bytes', bytes_key, {k: v for k, v in result.items() if k != 'timings'})
+        return result
+    
+    def _cache_settings(self, top_k: int) -> bytes:
+        """Key prefix: the settings that change a read of the same image."""
+        fallback = self.fallback is not None
+        return f'{self.recognizer.name}:{self.min_confidence}:{fallback}:{top_k}:'.encode()
+    
+    def _cached(self, level: str, key: str) -> Optional[Dict]:
+        """A cached read_cells() dict, with alternatives as (digit, confidence) tuples."""
+        result = self.cache.get(level, key)
+        if result is not None:
+            result['alternatives'] = [
+                [[tuple(pair) for pair in cell] for cell in row] for row in result['alternatives']
+            ]
+        return result
+    
+    def decode_image(self, image_bytes: bytes) -> Optional[np.ndarray]:
+        """
+        Decode image bytes to grayscale, at the smallest reduced scale that
+        keeps the longest side at least DECODE_MIN_SIDE pixels. The size is
+        read from the image header without decoding. Returns None if the
+        bytes are not an image.
+        """
+        flags = cv2.IMREAD_GRAYSCALE
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
+            from PIL import Image
+            longest = max(Image.open(io.BytesIO(image_bytes)).size)
+        except Exception:
+            longest = 0  # Unknown format (or no Pillow): let OpenCV decide
+        for factor, reduced in REDUCED_DECODE_FLAGS:
+            if longest // factor >= DECODE_MIN_SIDE:
+                flags = reduced
+                break
+        return cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flags)
+    
+    def _read(self, decode: Callable[[], Optional[np.ndarray]], top_k: int) -> Optional[Dict]:
+        """Decode an image and run the pipeline on it, timing the decode too."""
+        try:
+            start = time.perf_counter()
+            image = decode()
             if image is None:
                 return None
+            decode_time = time.perf_counter() - start
             
-            # Preprocess
-            processed = self.preprocess_image(image)
-            
-            # Find grid
-            result = self.find_grid(processed)
-            if result is None:
-                return None
-            
-            grid_image, _ = result
-            
-            # Split into cells
-            cells = self.split_into_cells(grid_image)
-            
-            # OCR each cell
-            grid = []
-            for row in range(9):
-                grid_row = []
-                for col in range(9):
-                    digit = self.recognize_digit(cells[row][col])
-                    grid_row.append(digit)
-                grid.append(grid_row)
-            
-            return grid
+            result = self.run_pipeline(image, top_k)
+            if result is not None:
+                result['timings'] = {'decode': decode_time, **result['timings']}
+            return result
         
         except Exception as e:
             print(f"OCR Error: {e}")
@@ -0,0 +1,266 @@
+"""
+Digit recognizers used by SudokuOCR.
+
+A recognizer takes the digit images of the non-blank cells (thresholded,
+ink = 255, cropped to the digit) and returns one (digit, confidence) pair
+per image; digit 0 means the image could not be read.
+
+pytesseract and Pillow are imported when Tesseract is first called, so the
+template engine works without them.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# (digit, confidence in [0, 1])
+Recognition = Tuple[int, float]
+
+# Montage layout: one digit per slot, scaled to DIGIT_HEIGHT pixels
+MONTAGE_COLUMNS = 9
+MONTAGE_SLOT = 64
+DIGIT_HEIGHT = 32
+
+# Template features: the padded digit downsampled to FEATURE_SIZE x FEATURE_SIZE
+FEATURE_SIZE = 20
+TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'digit_templates.npz')
+
+
+def pad_square(digit: np.ndarray, margin: int = 10) -> np.ndarray:
+    """Pad a digit image (ink = 255) to a square cell with a margin on every side."""
+    h, w = digit.shape[:2]
+    side = max(h, w) + 2 * margin
+    top = (side - h) // 2
+    left = (side - w) // 2
+    return cv2.copyMakeBorder(
+        digit, top, side - h - top, left, side - w - left, cv2.BORDER_CONSTANT, value=0
+    )
+
+
+def digit_features(digits: List[np.ndarray]) -> np.ndarray:
+    """
+    Feature matrix of digit images, one L2-normalized row per image: the
+    digit padded to a square (margin 1/8 of its size) and downsampled to
+    FEATURE_SIZE x FEATURE_SIZE, so features do not depend on digit scale.
+    """
+    features = np.zeros((len(digits), FEATURE_SIZE * FEATURE_SIZE), dtype=np.float32)
+    for k, digit in enumerate(digits):
+        square = pad_square(digit, max(1, max(digit.shape[:2]) // 8))
+        small = cv2.resize(square, (FEATURE_SIZE, FEATURE_SIZE), interpolation=cv2.INTER_AREA)
+        features[k] = small.reshape(-1)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-6)
+
+
+class DigitRecognizer:
+    """Interface of the OCR engines."""
+
+    name = ''
+
+    def recognize(self, digits: List[np.ndarray]) -> List[Recognition]:
+        """Recognize digit images; returns one (digit, confidence) pair per image."""
+        raise NotImplementedError
+
+    def load(self) -> None:
+        """Load model data ahead of the first call (engines without any do nothing)."""
+
+    def recognize_top_k(self, digits: List[np.ndarray], k: int = 3) -> List[List[Recognition]]:
+        """
+        Up to k (digit, confidence) alternatives per image, most likely first.
+        Engines without a ranking return their single answer.
+        """
+        return [[result] for result in self.recognize(digits)]
+
+
+class TesseractRecognizer(DigitRecognizer):
+    """
+    Tesseract OCR. All digits are recognized in one call on a montage image
+    (with use_montage); digits it cannot resolve, and every digit when
+    use_montage is False, are recognized one by one on up to max_workers
+    threads. Tesseract reports no per-character confidence here, so read
+    digits get confidence 1.0 and unread ones 0.0.
+    """
+
+    name = 'tesseract'
+
+    def __init__(self, use_montage: bool = True, max_workers: int = 4):
+        self.tesseract_config = r'--oem 3 --psm 10 -c tessedit_char_whitelist=123456789'
+        self.montage_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=123456789'
+        self.use_montage = use_montage
+        self.max_workers = max_workers
+
+    def recognize(self, digits: List[np.ndarray]) -> List[Recognition]:
+        results = self.recognize_montage(digits) if self.use_montage else [0] * len(digits)
+        pending = [k for k, value in enumerate(results) if not value]
+
+        if pending:
+            images = [pad_square(digits[k]) for k in pending]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(images)))) as pool:
+                for k, value in zip(pending, pool.map(self.recognize_digit, images)):
+                    results[k] = value
+
+        return [(value, 1.0 if value else 0.0) for value in results]
+
+    def _build_montage(self, digits: List[np.ndarray]) -> np.ndarray:
+        """
+        Place digit images (ink = 255) into a grid of MONTAGE_SLOT slots as
+        dark ink on white, scaled to DIGIT_HEIGHT, in the order given.
+        """
+        rows = (len(digits) + MONTAGE_COLUMNS - 1) // MONTAGE_COLUMNS
+        montage = np.full((rows * MONTAGE_SLOT, MONTAGE_COLUMNS * MONTAGE_SLOT), 255, dtype=np.uint8)
+
+        for k, digit in enumerate(digits):
+            h, w = digit.shape[:2]
+            width = min(max(1, round(w * DIGIT_HEIGHT / h)), MONTAGE_SLOT - 8)
+            scaled = cv2.resize(digit, (width, DIGIT_HEIGHT), interpolation=cv2.INTER_AREA)
+            row, col = divmod(k, MONTAGE_COLUMNS)
+            y = row * MONTAGE_SLOT + (MONTAGE_SLOT - DIGIT_HEIGHT) // 2
+            x = col * MONTAGE_SLOT + (MONTAGE_SLOT - width) // 2
+            montage[y:y + DIGIT_HEIGHT, x:x + width] = 255 - scaled
+
+        return montage
+
+    def recognize_montage(self, digits: List[np.ndarray]) -> List[int]:
+        """
+        Recognize many digit images with a single Tesseract call on a montage.
+        Character boxes are mapped back to their slots; slots with no box or
+        more than one are returned as 0.
+        """
+        if not digits:
+            return []
+        import pytesseract
+        from PIL import Image
+
+        montage = self._build_montage(digits)
+        height = montage.shape[0]
+
+        found: Dict[int, List[int]] = {}
+        try:
+            boxes = pytesseract.image_to_boxes(Image.fromarray(montage), config=self.montage_config)
+        except Exception as e:
+            print(f"OCR montage error: {e}")
+            return [0] * len(digits)
+
+        for line in boxes.splitlines():
+            parts = line.split()
+            if len(parts) < 5 or not parts[0].isdigit() or parts[0] == '0':
+                continue
+            x1, y1, x2, y2 = map(int, parts[1:5])
+            # Box coordinates have their origin at the bottom left
+            cx = (x1 + x2) / 2
+            cy = height - (y1 + y2) / 2
+            slot = int(cy // MONTAGE_SLOT) * MONTAGE_COLUMNS + int(cx // MONTAGE_SLOT)
+            found.setdefault(slot, []).append(int(parts[0]))
+
+        return [
+            found[k][0] if len(found.get(k, ())) == 1 else 0
+            for k in range(len(digits))
+        ]
+
+    def recognize_digit(self, cell_image: np.ndarray) -> int:
+        """Recognize digit in a cell using Tesseract OCR."""
+        import pytesseract
+        from PIL import Image
+
+        # Invert for Tesseract (expects dark text on light background)
+        cell_inv = cv2.bitwise_not(cell_image)
+
+        # Resize for better OCR
+        cell_resized = cv2.resize(cell_inv, (50, 50), interpolation=cv2.INTER_CUBIC)
+
+        # Convert to PIL Image
+        pil_image = Image.fromarray(cell_resized)
+
+        try:
+            text = pytesseract.image_to_string(pil_image, config=self.tesseract_config).strip()
+            if text and text.isdigit() and 1 <= int(text) <= 9:
+                return int(text)
+        except Exception:
+            pass
+
+        return 0
+
+
+class TemplateRecognizer(DigitRecognizer):
+    """
+    Nearest-template classifier in NumPy. Every digit is compared with all
+    stored templates in one matrix product (cosine similarity of
+    digit_features); each class scores its best matching template and the
+    confidence is the softmax of the class scores at the given temperature.
+    Templates are rendered and saved by ocr.train_templates and loaded on
+    first use (or by load()); a loaded recognizer can be shared by threads.
+    """
+
+    name = 'template'
+
+    def __init__(self, model_path: str = TEMPLATES_PATH, temperature: float = 0.02):
+        self.model_path = model_path
+        self.temperature = temperature
+        self._templates: Optional[np.ndarray] = None
+        self._class_starts: Optional[np.ndarray] = None
+        self._classes: Optional[np.ndarray] = None
+        self._load_lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load the templates once, sorted by label so classes are contiguous."""
+        with self._load_lock:
+            if self._templates is not None:
+                return
+            model = np.load(self.model_path)
+            labels = model['labels']
+            order = np.argsort(labels, kind='stable')
+            labels = labels[order]
+            self._classes, self._class_starts = np.unique(labels, return_index=True)
+            # Set last: other threads take a non-None _templates as fully loaded
+            self._templates = model['features'][order].astype(np.float32)
+
+    def class_probabilities(self, digits: List[np.ndarray]) -> np.ndarray:
+        """(N, 9) probabilities of the digits 1-9 for each digit image."""
+        if self._templates is None:
+            self.load()
+        if not digits:
+            return np.zeros((0, 9), dtype=np.float32)
+
+        similarity = digit_features(digits) @ self._templates.T
+        # Best matching template per class
+        scores = np.maximum.reduceat(similarity, self._class_starts, axis=1) / self.temperature
+        scores -= scores.max(axis=1, keepdims=True)
+        weights = np.exp(scores)
+
+        probabilities = np.zeros((len(digits), 9), dtype=np.float32)
+        probabilities[:, self._classes - 1] = weights / weights.sum(axis=1, keepdims=True)
+        return probabilities
+
+    def recognize(self, digits: List[np.ndarray]) -> List[Recognition]:
+        return [alternatives[0] for alternatives in self.recognize_top_k(digits, 1)]
+
+    def recognize_top_k(self, digits: List[np.ndarray], k: int = 3) -> List[List[Recognition]]:
+        probabilities = self.class_probabilities(digits)
+        ranked = np.argsort(-probabilities, axis=1, kind='stable')[:, :k]
+        return [
+            [(int(index) + 1, float(probabilities[n, index])) for index in row]
+            for n, row in enumerate(ranked)
+        ]
+
+
+# Engine name -> recognizer class
+OCR_ENGINES = {
+    'tesseract': TesseractRecognizer,
+    'template': TemplateRecognizer,
+}
+
+DEFAULT_OCR_ENGINE = 'tesseract'
+
+
+def create_recognizer(engine: str = DEFAULT_OCR_ENGINE, **kwargs) -> DigitRecognizer:
+    """Create the recognizer for the named engine; kwargs go to its constructor."""
+    try:
+        recognizer_class = OCR_ENGINES[engine]
+    except KeyError:
+        raise ValueError(
+            f"Unknown OCR engine '{engine}' (expected one of: {', '.join(OCR_ENGINES)})"
+        )
+    return recognizer_class(**kwargs)
@@ -0,0 +1,133 @@
+"""
+Solver-assisted correction of OCR reads.
+
+A single misread digit usually makes the grid invalid or ambiguous. Given
+the per-cell alternatives of SudokuOCR.read_cells(), repair_grid() looks
+for the cheapest set of edits that leaves a conflict-free grid with exactly
+one solution. Changing a cell from its read digit (probability p_read) to
+another option (probability p) costs log(p_read / p), so confident reads
+are expensive to touch. Edit sets are tried in order of increasing total
+cost, restricted to the least confident cells and to the cells involved
+in conflicts.
+"""
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sudoku.solver import UNITS, SolverTimeout, SudokuSolver
+
+# Probability assumed for options the recognizer did not rank, including
+# "this cell is actually blank"
+MIN_PROBABILITY = 1e-3
+
+# (cost, flat cell index, new digit; 0 = blank)
+Edit = Tuple[float, int, int]
+
+
+def conflict_cells(cells: Sequence[int]) -> Set[int]:
+    """Flat indexes of the cells whose digit repeats in one of their units."""
+    conflicts = set()
+    for unit in UNITS:
+        seen: Dict[int, int] = {}
+        for i in unit:
+            num = cells[i]
+            if not num:
+                continue
+            if num in seen:
+                conflicts.update((i, seen[num]))
+            else:
+                seen[num] = i
+    return conflicts
+
+
+def _candidate_edits(cells: Sequence[int], confidence: List[List[float]],
+                     alternatives: List[List[List[Tuple[int, float]]]],
+                     max_cells: int) -> List[Edit]:
+    """
+    Possible single-cell edits, cheapest first: every alternative digit and
+    blanking, for the conflicting cells and the max_cells least confident
+    non-blank cells.
+    """
+    filled = [i for i in range(81) if cells[i]]
+    filled.sort(key=lambda i: confidence[i // 9][i % 9])
+    chosen = conflict_cells(cells).union(filled[:max_cells])
+
+    edits = []
+    for i in chosen:
+        ranked = alternatives[i // 9][i % 9]
+        odds = {digit: max(p, MIN_PROBABILITY) for digit, p in ranked}
+        p_read = odds.get(cells[i], MIN_PROBABILITY)
+        # Probability mass the recognizer left to digits it did not rank
+        p_blank = max(MIN_PROBABILITY, 1.0 - sum(p for _, p in ranked))
+        edits.append((max(0.0, math.log(p_read / p_blank)), i, 0))
+        for digit, p in odds.items():
+            if digit and digit != cells[i]:
+                edits.append((max(0.0, math.log(p_read / p)), i, digit))
+    edits.sort()
+    return edits
+
+
+def _is_unique(cells: bytes, time_limit: Optional[float]) -> bool:
+    """True if cells has no conflicts and exactly one solution."""
+    solver = SudokuSolver(cells)
+    if solver.has_conflict:
+        return False
+    solver.time_limit = time_limit
+    try:
+        return solver.count_solutions(2) == 1
+    except SolverTimeout:
+        return False
+
+
+def repair_grid(grid: List[List[int]], confidence: List[List[float]],
+                alternatives: List[List[List[Tuple[int, float]]]],
+                max_edits: int = 3, max_cells: int = 12, max_checks: int = 200,
+                time_limit: Optional[float] = 0.25, time_budget: float = 2.0) -> Optional[Dict]:
+    """
+    Find the minimum-cost edit of an OCR grid that is conflict-free and
+    uniquely solvable. Returns a dict with the repaired 'grid', the 'edits'
+    made ({'row', 'col', 'read', 'digit'}, empty if the grid was already
+    fine) and their total 'cost', or None if no edit set of up to max_edits
+    cells was found within max_checks solver checks and time_budget seconds.
+    Each check may search for at most time_limit seconds.
+    """
+    deadline = time.perf_counter() + time_budget
+    cells = bytearray(num for row in grid for num in row)
+    edits = _candidate_edits(cells, confidence, alternatives, max_cells)
+
+    # Best-first over index combinations of the sorted edits: each popped
+    # combination spawns its successor (last index + 1) and its extension,
+    # which enumerates every combination once in order of increasing cost
+    heap: List[Tuple[float, Tuple[int, ...]]] = [(0.0, ())]
+    checks = 0
+    while heap and checks < max_checks and time.perf_counter() < deadline:
+        cost, combination = heapq.heappop(heap)
+
+        following = combination[-1] + 1 if combination else 0
+        if following < len(edits):
+            if combination:
+                heapq.heappush(heap, (cost - edits[following - 1][0] + edits[following][0],
+                                      combination[:-1] + (following,)))
+            if len(combination) < max_edits:
+                heapq.heappush(heap, (cost + edits[following][0], combination + (following,)))
+
+        touched = [edits[k][1] for k in combination]
+        if len(set(touched)) != len(touched):
+            continue  # Two edits of the same cell
+
+        candidate = bytearray(cells)
+        for k in combination:
+            candidate[edits[k][1]] = edits[k][2]
+        checks += 1
+        if _is_unique(bytes(candidate), time_limit):
+            return {
+                'grid': [list(candidate[r * 9:r * 9 + 9]) for r in range(9)],
+                'edits': [
+                    {'row': edits[k][1] // 9, 'col': edits[k][1] % 9,
+                     'read': cells[edits[k][1]], 'digit': edits[k][2]}
+                    for k in combination
+                ],
+                'cost': cost,
+            }
+    return None
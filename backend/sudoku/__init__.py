@@ -1,4 +1,13 @@
 from .solver import SudokuSolver
+from .dlx import DLXSolver
+from .engines import SOLVER_ENGINES, DEFAULT_ENGINE, create_solver
 from .generator import SudokuGenerator
 
-__all__ = ['SudokuSolver', 'SudokuGenerator']
+__all__ = [
+    'SudokuSolver',
+    'DLXSolver',
+    'SudokuGenerator',
+    'SOLVER_ENGINES',
+    'DEFAULT_ENGINE',
+    'create_solver',
+]
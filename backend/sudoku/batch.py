@@ -0,0 +1,64 @@
+"""
+Solving many grids per call, spread across worker processes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .engines import DEFAULT_ENGINE
+from .grid import Grid, to_cells
+from .tasks import solve_many_task
+
+
+def chunk_grids(grids: Iterable[Union[str, Grid]], chunk_size: int
+                ) -> Tuple[List[List[Tuple[int, bytes]]], List[Tuple[int, Dict]]]:
+    """
+    Parse grids and split them into chunks of (index, cell bytes) pairs.
+    Returns (chunks, errors); errors are (index, result) pairs with status
+    'error' for grids that could not be parsed.
+    """
+    chunks = []
+    errors = []
+    chunk = []
+    for index, value in enumerate(grids):
+        try:
+            chunk.append((index, bytes(to_cells(value))))
+        except (ValueError, TypeError) as e:
+            errors.append((index, {'status': 'error', 'error': str(e)}))
+            continue
+        if len(chunk) >= chunk_size:
+            chunks.append(chunk)
+            chunk = []
+    if chunk:
+        chunks.append(chunk)
+    return chunks, errors
+
+
+def solve_batch(grids: Iterable[Union[str, Grid]], engine: str = DEFAULT_ENGINE,
+                workers: Optional[int] = None, chunk_size: int = 64,
+                time_limit: Optional[float] = None) -> Iterator[Tuple[int, Dict]]:
+    """
+    Solve many grids (lists of rows or strings, any supported size) in parallel.
+
+    Yields (index, result) pairs in completion order, where index is the
+    position of the grid in the input and result is a solve_task dict
+    ('solved', 'invalid', 'unsolvable', 'timeout' or 'error' status;
+    solutions are cell bytes).
+    workers defaults to the CPU count; workers=0 solves in this process.
+    Grids are sent to the workers in chunks to amortize process overhead.
+    """
+    chunks, errors = chunk_grids(grids, chunk_size)
+    yield from errors
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 0 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from solve_many_task(chunk, engine, time_limit)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        futures = [executor.submit(solve_many_task, chunk, engine, time_limit) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,94 @@
+"""
+LRU cache of solve results keyed by the canonical form of the puzzle.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .canonical import canonical_form
+from .transforms import Transform
+
+CacheKey = Tuple[bytes, Transform]
+
+
+class SolutionCache:
+    """
+    Stores solve results in canonical coordinates, so a relabeled, permuted
+    or transposed copy of a cached puzzle is a hit; the stored solution is
+    mapped back through the inverse transform. Entries are evicted least
+    recently used first beyond max_size and expire ttl seconds after they
+    were stored.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: Optional[float] = 86400.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: 'OrderedDict[bytes, Tuple[float, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, cells: bytes) -> Tuple[CacheKey, Optional[Dict]]:
+        """
+        Look up the puzzle given as 81 cell bytes.
+        Returns (key, result); result is None on a miss, otherwise a solve_task
+        style dict in the puzzle's own frame. Pass key to store() after solving.
+        """
+        canonical, transform = canonical_form(cells)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(canonical)
+            if entry is not None and self.ttl is not None and now - entry[0] > self.ttl:
+                del self._entries[canonical]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return (canonical, transform), None
+            self._entries.move_to_end(canonical)
+            self.hits += 1
+
+        result = dict(entry[1])
+        if result.get('solution') is not None:
+            result['solution'] = transform.unapply(result['solution'])
+        return (canonical, transform), result
+
+    def store(self, key: CacheKey, result: Dict) -> None:
+        """Cache the solve result (in the puzzle's own frame) for key from lookup()."""
+        if self.max_size <= 0:
+            return
+        canonical, transform = key
+        result = dict(result)
+        if result.get('solution') is not None:
+            result['solution'] = transform.apply(result['solution'])
+
+        with self._lock:
+            self._entries[canonical] = (time.monotonic(), result)
+            self._entries.move_to_end(canonical)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -0,0 +1,147 @@
+"""
+Canonical form of a puzzle under the Sudoku symmetry group.
+
+Two puzzles that differ only by digit relabeling, row/column permutations
+within bands/stacks, band/stack swaps and transposition get the same
+canonical form, so they can share one cached solution.
+
+The exact minimum over all 2 * 6^8 positional symmetries is too slow to
+compute per request, so lines are first ordered by invariants (clue counts
+and digit frequencies, refined through the lines they cross) and only lines
+that stay tied are permuted exhaustively. If the ties would need more than
+MAX_CANDIDATES arrangements only the first ones are tried; the result is
+then still a valid transform of the puzzle, just not always canonical.
+"""
+from itertools import permutations, product
+from typing import Dict, List, Sequence, Tuple
+
+from .transforms import Transform
+
+MAX_CANDIDATES = 512
+
+# Refinement rounds over the row/column invariants
+REFINE_ROUNDS = 2
+
+
+def _rank(values: Sequence) -> List[int]:
+    """Replace each value by its rank among the distinct values."""
+    ranks = {value: i for i, value in enumerate(sorted(set(values)))}
+    return [ranks[value] for value in values]
+
+
+def _line_colors(cells: bytes, freq: Sequence[int]) -> Tuple[List[int], List[int]]:
+    """
+    Invariant colors for the rows and columns of cells: equal for lines that
+    a symmetry of the puzzle could map onto each other.
+    """
+    row_items = [[(c, freq[cells[r * 9 + c]]) for c in range(9) if cells[r * 9 + c]] for r in range(9)]
+    col_items = [[(r, freq[cells[r * 9 + c]]) for r in range(9) if cells[r * 9 + c]] for c in range(9)]
+
+    row_colors = _rank([tuple(sorted(f for _, f in items)) for items in row_items])
+    col_colors = _rank([tuple(sorted(f for _, f in items)) for items in col_items])
+
+    for _ in range(REFINE_ROUNDS):
+        band_colors = [tuple(sorted(row_colors[b * 3:b * 3 + 3])) for b in range(3)]
+        stack_colors = [tuple(sorted(col_colors[s * 3:s * 3 + 3])) for s in range(3)]
+        new_rows = _rank([
+            (row_colors[r], band_colors[r // 3],
+             tuple(sorted((col_colors[c], stack_colors[c // 3], f) for c, f in row_items[r])))
+            for r in range(9)
+        ])
+        new_cols = _rank([
+            (col_colors[c], stack_colors[c // 3],
+             tuple(sorted((row_colors[r], band_colors[r // 3], f) for r, f in col_items[c])))
+            for c in range(9)
+        ])
+        row_colors, col_colors = new_rows, new_cols
+
+    return row_colors, col_colors
+
+
+def _tied_orders(items: Sequence[int], key) -> List[List[int]]:
+    """All orders of items sorted by key, permuting items with equal keys."""
+    ordered = sorted(items, key=key)
+    groups = []
+    for item in ordered:
+        if groups and key(groups[-1][0]) == key(item):
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return [
+        [item for group in choice for item in group]
+        for choice in product(*(permutations(group) for group in groups))
+    ]
+
+
+def _line_orders(colors: Sequence[int]) -> List[List[int]]:
+    """Candidate orders of the 9 rows (or columns) given their colors."""
+    band_key = {b: tuple(sorted(colors[b * 3:b * 3 + 3])) for b in range(3)}
+    within = {b: _tied_orders(range(b * 3, b * 3 + 3), colors.__getitem__) for b in range(3)}
+    orders = []
+    for bands in _tied_orders(range(3), band_key.__getitem__):
+        for lines in product(*(within[b] for b in bands)):
+            orders.append([line for band in lines for line in band])
+    return orders
+
+
+def _signature(row_colors: Sequence[int], col_colors: Sequence[int]) -> Tuple:
+    """Orientation-dependent summary used to decide whether to transpose."""
+    return (
+        sorted(tuple(sorted(row_colors[b * 3:b * 3 + 3])) for b in range(3)),
+        sorted(tuple(sorted(col_colors[s * 3:s * 3 + 3])) for s in range(3)),
+    )
+
+
+def _relabel(cells: bytes) -> Tuple[bytes, List[int]]:
+    """Relabel digits in order of first appearance; returns (cells, digit map)."""
+    digits = [0] * 10
+    label = 0
+    for num in cells:
+        if num and not digits[num]:
+            label += 1
+            digits[num] = label
+    # Digits absent from the puzzle take the remaining labels
+    for num in range(1, 10):
+        if not digits[num]:
+            label += 1
+            digits[num] = label
+    return cells.translate(bytes(digits) + bytes(range(10, 256))), digits
+
+
+def canonical_form(cells: bytes) -> Tuple[bytes, Transform]:
+    """
+    Canonical form of 81 cell bytes.
+    Returns (canonical cells, transform) with transform.apply(cells) equal to
+    the canonical cells, so transform.unapply maps results back.
+    """
+    cells = bytes(cells)
+    freq = [0] * 10
+    for num in cells:
+        freq[num] += 1
+    freq[0] = 0
+
+    row_colors, col_colors = _line_colors(cells, freq)
+    orientations: Dict[bool, Tuple[List[int], List[int]]] = {
+        False: (row_colors, col_colors),
+        True: (col_colors, row_colors),
+    }
+    best_signature = min(_signature(*colors) for colors in orientations.values())
+
+    best = None
+    tried = 0
+    for transpose, (rows, cols) in orientations.items():
+        if _signature(rows, cols) != best_signature:
+            continue
+        col_orders = _line_orders(cols)
+        for row_order in _line_orders(rows):
+            for col_order in col_orders:
+                if tried >= MAX_CANDIDATES:
+                    break
+                tried += 1
+                transform = Transform.from_line_orders(transpose, row_order, col_order)
+                candidate, digits = _relabel(transform.apply(cells))
+                if best is None or candidate < best[0]:
+                    best = (candidate, transform.positions, digits)
+
+    canonical, positions, digits = best
+    return canonical, Transform(positions, digits)
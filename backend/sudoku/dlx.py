@@ -0,0 +1,431 @@
+"""
+Sudoku solver using Knuth's Algorithm X with Dancing Links (DLX).
+
+Sudoku is encoded as an exact-cover problem with 4 * N * N constraint
+columns (cell filled, row has digit, column has digit, box has digit) and
+N ** 3 candidate rows (one per cell/digit pair) for an N x N grid: 324 and
+729 for 9x9. Links are stored in flat lists
+instead of node objects to keep the inner loops cheap.
+"""
+import time
+from typing import Dict, Optional, List, Union
+
+from .geometry import get_geometry
+from .grid import Grid, from_bytes, grid_size, to_cells
+from .solver import SolverTimeout
+
+
+class DLXSolver:
+    """Solves Sudoku puzzles as an exact-cover problem using Dancing Links."""
+
+    __slots__ = (
+        'cells', 'size', 'num_columns', 'solutions', 'max_solutions', 'has_conflict', 'time_limit',
+        'L', 'R', 'U', 'D', 'C', 'S', 'node_cell', 'node_digit', 'row_start',
+        '_given_rows', '_deadline', '_nodes', '_timed_out', '_started',
+        'collect_stats', 'backtracks', 'branches', 'max_depth',
+        'candidate_computations', 'elapsed',
+    )
+
+    def __init__(self, grid: Union[Grid, str, bytes]):
+        """
+        Initialize solver with a 9x9, 16x16 or 25x25 grid.
+        Grid should be a list of N lists, each containing N integers (0-N, 0 = empty),
+        or the same puzzle in string notation or as N * N cell bytes.
+        """
+        # Flat cell values of the puzzle, row by row
+        self.cells = to_cells(grid)
+        self.size = grid_size(len(self.cells))
+        self.num_columns = 4 * len(self.cells)
+        self.solutions = []  # Solutions of the last search, as cell bytes
+        self.max_solutions = 2  # Stop after finding 2 solutions
+        self.has_conflict = False
+        self.time_limit = None  # Seconds allowed per search (None = unlimited)
+        self._deadline = None
+        self._nodes = 0
+        self._timed_out = False
+        self._started = 0.0
+
+        # Counters of the last search, kept when collect_stats is set (see search_stats)
+        self.collect_stats = False
+        self.backtracks = 0  # Dead ends: nodes with an unsatisfiable column
+        self.branches = 0  # Nodes whose chosen column had more than one row
+        self.max_depth = 0  # Most guesses (columns with several rows) on one search path
+        self.candidate_computations = 0  # Column choices (scans of the column sizes)
+        self.elapsed = 0.0  # Wall time of the search in seconds
+
+        self._build_links()
+        self._cover_givens()
+
+    def _build_links(self) -> None:
+        """Build the toroidal linked structure for the empty Sudoku."""
+        num_columns = self.num_columns
+        size = self.size
+        cell_count = size * size
+        box_of = get_geometry(size).box_of
+        # Node 0 is the root, nodes 1..num_columns are the column headers
+        self.L = [i - 1 for i in range(num_columns + 1)]
+        self.R = [i + 1 for i in range(num_columns + 1)]
+        self.L[0] = num_columns
+        self.R[num_columns] = 0
+        self.U = list(range(num_columns + 1))
+        self.D = list(range(num_columns + 1))
+        self.C = list(range(num_columns + 1))
+        self.S = [0] * (num_columns + 1)
+        # Cell index and digit of the candidate row each node belongs to
+        self.node_cell = [-1] * (num_columns + 1)
+        self.node_digit = [0] * (num_columns + 1)
+        # First node of the candidate row for each cell * N + (digit - 1)
+        self.row_start = []
+
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        for row in range(size):
+            for col in range(size):
+                cell = row * size + col
+                box = box_of[cell]
+                for digit in range(size):
+                    columns = (
+                        1 + cell,
+                        1 + cell_count + row * size + digit,
+                        1 + 2 * cell_count + col * size + digit,
+                        1 + 3 * cell_count + box * size + digit,
+                    )
+                    first = len(C)
+                    for k, column in enumerate(columns):
+                        node = first + k
+                        # Insert at the bottom of the column
+                        C.append(column)
+                        U.append(U[column])
+                        D.append(column)
+                        D[U[column]] = node
+                        U[column] = node
+                        S[column] += 1
+                        # Link into the row ring
+                        L.append(first + (k - 1) % 4)
+                        R.append(first + (k + 1) % 4)
+                        self.node_cell.append(cell)
+                        self.node_digit.append(digit + 1)
+                    self.row_start.append(first)
+
+    def _cover(self, column: int) -> None:
+        """Remove a column and every row that intersects it."""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[column]] = R[column]
+        L[R[column]] = L[column]
+        i = D[column]
+        while i != column:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, column: int) -> None:
+        """Restore a column removed by _cover (in reverse order)."""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[column]
+        while i != column:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[column]] = column
+        L[R[column]] = column
+
+    def _cover_givens(self) -> None:
+        """Select the candidate rows of the given digits."""
+        self.has_conflict = False
+        # First nodes of the selected given rows, in covering order
+        self._given_rows = []
+        for cell, num in enumerate(self.cells):
+            if not num:
+                continue
+            first = self.row_start[cell * self.size + num - 1]
+            if not self._row_free(first):
+                # Two givens claim the same cell/row/column/box digit
+                self.has_conflict = True
+                return
+            self._select_row(first)
+            self._given_rows.append(first)
+
+    def _uncover_givens(self) -> None:
+        """Undo _cover_givens, restoring the links of the empty Sudoku."""
+        while self._given_rows:
+            self._deselect_row(self._given_rows.pop())
+
+    def _row_free(self, first: int) -> bool:
+        """Whether none of the columns of a candidate row is covered."""
+        L, R, C = self.L, self.R, self.C
+        return all(R[L[C[node]]] == C[node] for node in range(first, first + 4))
+
+    def _select_row(self, first: int) -> None:
+        """Cover the four columns of a candidate row."""
+        C = self.C
+        for node in range(first, first + 4):
+            self._cover(C[node])
+
+    def _deselect_row(self, first: int) -> None:
+        """Undo _select_row (in reverse order)."""
+        C = self.C
+        for node in range(first + 3, first - 1, -1):
+            self._uncover(C[node])
+
+    def _hide_row(self, first: int) -> None:
+        """Unlink a candidate row from its columns."""
+        U, D, C, S = self.U, self.D, self.C, self.S
+        for node in range(first, first + 4):
+            D[U[node]] = D[node]
+            U[D[node]] = U[node]
+            S[C[node]] -= 1
+
+    def _unhide_row(self, first: int) -> None:
+        """Relink a candidate row hidden by _hide_row."""
+        U, D, C, S = self.U, self.D, self.C, self.S
+        for node in range(first + 3, first - 1, -1):
+            S[C[node]] += 1
+            D[U[node]] = node
+            U[D[node]] = node
+
+    def _search(self, find_all: bool) -> None:
+        """
+        Algorithm X search over the remaining columns.
+        The search is an explicit stack of (column, selected row) levels
+        rather than Python recursion, so grids with hundreds of empty cells
+        (25x25) stay far from the recursion limit. It stops at the first
+        solution (or max_solutions with find_all) or at the time limit, and
+        the links are restored before returning either way.
+        """
+        L, R, D, C, S = self.L, self.R, self.D, self.C, self.S
+        cover, uncover = self._cover, self._uncover
+        collect_stats = self.collect_stats
+        # Per level: the covered column and the row selected from it (the
+        # column itself before the first row is tried)
+        columns: List[int] = []
+        selected: List[int] = []
+        # Per level: whether its column had more than one row (a guess)
+        guesses: List[bool] = []
+        depth = 0  # Guesses on the current path
+
+        while True:
+            # Expand a new node: stop, record a solution or choose a column
+            self._nodes += 1
+            if self._deadline is not None and not self._nodes & 255 and time.perf_counter() > self._deadline:
+                self._timed_out = True
+                break
+
+            if R[0] == 0:
+                self._record_solution(selected)
+                if not find_all or len(self.solutions) >= self.max_solutions:
+                    break
+            else:
+                # Choose the column with the fewest remaining rows
+                column = R[0]
+                best = column
+                best_size = S[column]
+                while column and best_size > 1:
+                    if S[column] < best_size:
+                        best, best_size = column, S[column]
+                    column = R[column]
+                self.candidate_computations += 1
+                if best_size == 0:
+                    self.backtracks += 1
+                else:
+                    guess = best_size > 1
+                    if guess:
+                        self.branches += 1
+                        depth += 1
+                        if collect_stats and depth > self.max_depth:
+                            self.max_depth = depth
+                    cover(best)
+                    columns.append(best)
+                    selected.append(best)
+                    guesses.append(guess)
+
+            # Select the next row of the deepest level that has one left
+            while columns:
+                column, i = columns[-1], selected[-1]
+                if i != column:
+                    j = L[i]
+                    while j != i:
+                        uncover(C[j])
+                        j = L[j]
+                i = D[i]
+                if i != column:
+                    selected[-1] = i
+                    j = R[i]
+                    while j != i:
+                        cover(C[j])
+                        j = R[j]
+                    break
+                # Backtrack
+                uncover(column)
+                columns.pop()
+                selected.pop()
+                if guesses.pop():
+                    depth -= 1
+            else:
+                return
+
+        # Stopped early: restore the links level by level
+        while columns:
+            column, i = columns.pop(), selected.pop()
+            if i != column:
+                j = L[i]
+                while j != i:
+                    uncover(C[j])
+                    j = L[j]
+            uncover(column)
+
+    def _record_solution(self, selected: List[int]) -> None:
+        """Fill the selected candidate rows into a copy of the puzzle cells."""
+        solution = bytearray(self.cells)
+        node_cell, node_digit = self.node_cell, self.node_digit
+        for node in selected:
+            solution[node_cell[node]] = node_digit[node]
+        self.solutions.append(bytes(solution))
+
+    def solve(self, find_all: bool = False) -> bool:
+        """
+        Solve the Sudoku puzzle using Algorithm X.
+        Returns True if solution found, False otherwise.
+        If find_all=True, finds all solutions (up to max_solutions).
+        """
+        if self.has_conflict:
+            return False
+        self.solutions = []
+        self._start_clock()
+        self._search(find_all)
+        self._stop_clock()
+        return bool(self.solutions)
+
+    def _start_clock(self) -> None:
+        """Arm the time limit for a new search."""
+        self._nodes = 0
+        self.backtracks = 0
+        self.branches = 0
+        self.max_depth = 0
+        self.candidate_computations = 0
+        self.elapsed = 0.0
+        self._timed_out = False
+        self._started = time.perf_counter()
+        self._deadline = self._started + self.time_limit if self.time_limit else None
+
+    def _stop_clock(self) -> None:
+        """Raise SolverTimeout if the search was aborted by the time limit."""
+        if self.collect_stats:
+            self.elapsed = time.perf_counter() - self._started
+        if self._timed_out:
+            raise SolverTimeout(f"Search exceeded {self.time_limit} seconds")
+
+    def clear_cell(self, row: int, col: int) -> None:
+        """Remove the given digit at (row, col) from the puzzle."""
+        cell = row * self.size + col
+        num = self.cells[cell]
+        if not num:
+            return
+        self.cells[cell] = 0
+        if self.has_conflict:
+            self._uncover_givens()
+            self._cover_givens()
+            return
+        # Dancing links only restore in reverse order: deselect the givens
+        # covered after this one, then select them again without it
+        given_rows = self._given_rows
+        position = given_rows.index(self.row_start[cell * self.size + num - 1])
+        later = given_rows[position + 1:]
+        for first in reversed(later):
+            self._deselect_row(first)
+        self._deselect_row(given_rows[position])
+        del given_rows[position:]
+        for first in later:
+            self._select_row(first)
+            given_rows.append(first)
+
+    def set_cell(self, row: int, col: int, num: int) -> None:
+        """Put num back as a given at the empty cell (row, col); num must not conflict."""
+        cell = row * self.size + col
+        self.cells[cell] = num
+        first = self.row_start[cell * self.size + num - 1]
+        if self.has_conflict or not self._row_free(first):
+            self._uncover_givens()
+            self._cover_givens()
+            return
+        # The restored given goes on top of the stack, so it is the cheapest
+        # to clear again
+        self._select_row(first)
+        self._given_rows.append(first)
+
+    def has_alternative(self, row: int, col: int, num: int) -> bool:
+        """
+        Check whether the puzzle has a solution with a digit other than num at
+        the empty cell (row, col), i.e. solve with num excluded from that cell.
+        """
+        self.solutions = []
+        if self.has_conflict:
+            return False
+        first = self.row_start[(row * self.size + col) * self.size + num - 1]
+        linked = self.D[self.U[first]] == first
+        if linked:
+            self._hide_row(first)
+        # Otherwise num is already ruled out there by another given
+        self._start_clock()
+        self._search(False)
+        if linked:
+            self._unhide_row(first)
+        self._stop_clock()
+        return bool(self.solutions)
+
+    @property
+    def grid(self) -> Grid:
+        """The puzzle as a list of rows."""
+        return from_bytes(self.cells)
+
+    def get_solution_cells(self) -> Optional[bytes]:
+        """Get the solution as cell bytes. Returns None if unsolvable."""
+        if self.solve():
+            return self.solutions[0]
+        return None
+
+    def get_solution(self) -> Optional[Grid]:
+        """Get the solved grid. Returns None if unsolvable."""
+        cells = self.get_solution_cells()
+        return from_bytes(cells) if cells is not None else None
+
+    def count_solutions(self, limit: Optional[int] = None) -> int:
+        """
+        Count the number of solutions, stopping once limit solutions are found
+        (defaults to max_solutions).
+        """
+        if limit is not None:
+            self.max_solutions = limit
+        self.solutions = []
+        self.solve(find_all=True)
+        return len(self.solutions)
+
+    def search_stats(self) -> Optional[Dict]:
+        """
+        Counters of the last search, with the same keys and meanings as
+        SudokuSolver.search_stats(); 'max_depth' counts the guesses (columns
+        with several rows) on one path, not the forced rows selected with
+        them. Algorithm X makes no deductions, so 'propagations' is always
+        0. None unless collect_stats was set.
+        """
+        if not self.collect_stats:
+            return None
+        return {
+            'nodes': self._nodes,
+            'backtracks': self.backtracks,
+            'branches': self.branches,
+            'max_depth': self.max_depth,
+            'candidate_computations': self.candidate_computations,
+            'propagations': 0,
+            'elapsed': self.elapsed,
+        }
+
+    def is_valid_grid(self) -> bool:
+        """Check if the initial grid is valid (no conflicts)."""
+        return not self.has_conflict
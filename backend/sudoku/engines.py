@@ -0,0 +1,26 @@
+"""
+Registry of solver engines that share the SudokuSolver interface.
+"""
+from typing import List, Union
+
+from .solver import SudokuSolver
+from .dlx import DLXSolver
+
+# Engine name -> solver class
+SOLVER_ENGINES = {
+    'backtracking': SudokuSolver,
+    'dlx': DLXSolver,
+}
+
+DEFAULT_ENGINE = 'backtracking'
+
+
+def create_solver(grid: List[List[int]], engine: str = DEFAULT_ENGINE) -> Union[SudokuSolver, DLXSolver]:
+    """Create a solver for grid using the named engine."""
+    try:
+        solver_class = SOLVER_ENGINES[engine]
+    except KeyError:
+        raise ValueError(
+            f"Unknown solver engine '{engine}' (expected one of: {', '.join(SOLVER_ENGINES)})"
+        )
+    return solver_class(grid)
@@ -1,140 +1,353 @@
 """
 Sudoku puzzle generator with difficulty levels.
+
+Generates 9x9 puzzles, and 16x16 and 25x25 puzzles by search. Large grids
+are slow to thin out, so generation can be given a time budget, and the
+clue count a search reaches can fall short of the difficulty asked for:
+clue_difficulty() tells the difficulty a puzzle actually has.
 """
 import random
-from typing import List, Tuple
-from .solver import SudokuSolver
+import time
+from typing import Dict, List, Optional, Tuple
+from .dlx import DLXSolver
+from .engines import SOLVER_ENGINES, DEFAULT_ENGINE, create_solver
+from .geometry import get_geometry
+from .grading import GRADES, rate
+from .grid import Grid, from_bytes, to_bytes
+from .solver import SolverTimeout
+from .transforms import random_transform
 
 
 class SudokuGenerator:
     """Generates valid Sudoku puzzles with exactly one solution."""
     
-    # Difficulty settings: (min_clues, max_clues, recursion_depth_threshold)
+    # Difficulty settings: (min_clues, max_clues) of a 9x9 grid; larger grids
+    # scale them by their number of cells
     DIFFICULTY_SETTINGS = {
-        'easy': (36, 46, 5),
-        'medium': (28, 35, 10),
-        'hard': (22, 27, 20),
-        'expert': (17, 21, 50)
+        'easy': (36, 46),
+        'medium': (28, 35),
+        'hard': (22, 27),
+        'expert': (17, 21)
     }
     
-    def __init__(self):
+    def __init__(self, engine: str = DEFAULT_ENGINE, size: int = 9):
+        """
+        Initialize generator; engine names the solver used for uniqueness
+        checks and size is the side length of the grids (9, 16 or 25).
+        """
+        if engine not in SOLVER_ENGINES:
+            raise ValueError(f"Unknown solver engine '{engine}'")
         self.solver = None
+        self.engine = engine
+        self.size = size
+        self.geometry = get_geometry(size)
+        # Seconds allowed per generate() or generate_graded() call (None =
+        # unlimited). Once it is spent, clue removal stops (the puzzle is
+        # still unique but keeps more clues than the difficulty asks for)
+        # and generate_graded() makes no further attempts.
+        self.time_budget: Optional[float] = None
+        # Seconds allowed per uniqueness check (None = unlimited). A few
+        # checks on large grids take far longer than the rest; a clue whose
+        # check runs out is kept and removal goes on with the next cell.
+        self.check_time_limit: Optional[float] = None if size == 9 else 0.25
+        # Where the last generate*() call spent its time, see _reset_timings
+        self.timings: Dict[str, float] = {}
+        self._reset_timings()
+    
+    def _reset_timings(self) -> None:
+        """
+        Clear the per-phase timings: seconds spent filling complete grids
+        ('fill'), removing clues apart from the uniqueness checks
+        ('removal'), in the uniqueness checks themselves ('uniqueness',
+        'uniqueness_checks' of them, 'uniqueness_timeouts' cut short by
+        check_time_limit), rating candidates ('grading') and
+        transforming seeds ('transform'); 'retries' counts discarded
+        candidates and 'total' the whole call.
+        """
+        self.timings = {
+            'fill': 0.0,
+            'removal': 0.0,
+            'uniqueness': 0.0,
+            'uniqueness_checks': 0,
+            'uniqueness_timeouts': 0,
+            'grading': 0.0,
+            'transform': 0.0,
+            'retries': 0,
+            'total': 0.0,
+        }
+    
+    def _require_9x9(self, method: str) -> None:
+        if self.size != 9:
+            raise ValueError(f"{method} generation only supports 9x9 grids")
     
     def generate_complete_grid(self) -> List[List[int]]:
         """Generate a complete, valid Sudoku grid."""
-        grid = [[0] * 9 for _ in range(9)]
-        self._fill_grid(grid)
-        return grid
+        return from_bytes(self._fill_grid())
     
-    def _fill_grid(self, grid: List[List[int]]) -> bool:
-        """Recursively fill grid using backtracking."""
-        for row in range(9):
-            for col in range(9):
-                if grid[row][col] == 0:
-                    nums = list(range(1, 10))
-                    random.shuffle(nums)
-                    for num in nums:
-                        if self._is_valid(grid, row, col, num):
-                            grid[row][col] = num
-                            if self._fill_grid(grid):
-                                return True
-                            grid[row][col] = 0
-                    return False
-        return True
+    def _fill_grid(self, deadline: Optional[float] = None) -> bytearray:
+        """
+        Fill an empty grid cell by cell in random digit order.
+        The backtracking is an explicit stack of shuffled candidate lists,
+        one per filled cell, with row/column/box occupancy kept as bitmasks.
+        Cell-by-cell filling gets lost on larger grids, which are filled by
+        _fill_by_solving instead, within deadline.
+        """
+        if self.size != 9:
+            return self._fill_by_solving(deadline)
+        
+        start = time.perf_counter()
+        geometry = self.geometry
+        row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        all_digits, digit_bits = geometry.all_digits, geometry.digit_bits
+        digits = range(1, geometry.size + 1)
+        cells = bytearray(geometry.cell_count)
+        rows = [0] * geometry.size
+        cols = [0] * geometry.size
+        boxes = [0] * geometry.size
+        # stack[i] holds the untried digits of cell i
+        stack = []
+        
+        while len(stack) < geometry.cell_count:
+            index = len(stack)
+            row, col, box = row_of[index], col_of[index], box_of[index]
+            mask = all_digits & ~(rows[row] | cols[col] | boxes[box])
+            nums = [num for num in digits if mask & digit_bits[num]]
+            random.shuffle(nums)
+            stack.append(nums)
+            
+            # Place the next untried digit, backing up past exhausted cells
+            while stack:
+                index = len(stack) - 1
+                row, col, box = row_of[index], col_of[index], box_of[index]
+                if cells[index]:
+                    bit = ~digit_bits[cells[index]]
+                    rows[row] &= bit
+                    cols[col] &= bit
+                    boxes[box] &= bit
+                    cells[index] = 0
+                nums = stack[-1]
+                if nums:
+                    num = nums.pop()
+                    bit = digit_bits[num]
+                    rows[row] |= bit
+                    cols[col] |= bit
+                    boxes[box] |= bit
+                    cells[index] = num
+                    break
+                stack.pop()
+        
+        self.timings['fill'] += time.perf_counter() - start
+        return cells
     
-    def _is_valid(self, grid: List[List[int]], row: int, col: int, num: int) -> bool:
-        """Check if placing num at (row, col) is valid."""
-        # Check row
-        for c in range(9):
-            if grid[row][c] == num:
-                return False
-        
-        # Check column
-        for r in range(9):
-            if grid[r][col] == num:
-                return False
-        
-        # Check 3x3 box
-        box_row = (row // 3) * 3
-        box_col = (col // 3) * 3
-        for r in range(box_row, box_row + 3):
-            for c in range(box_col, box_col + 3):
-                if grid[r][c] == num:
-                    return False
-        
-        return True
+    def _fill_by_solving(self, deadline: Optional[float] = None) -> bytearray:
+        """
+        Fill the boxes on the diagonal with random permutations (they share
+        no row, column or box, so any digits fit) and let the solver
+        complete the rest of the grid. Raises SolverTimeout if that takes
+        past the deadline (a time.perf_counter() value).
+        Dancing links finds a first solution of such a sparse grid more
+        than ten times faster than propagation (0.05 s against 0.7 s for
+        25x25), leaving the budget to clue removal, so the fill always uses
+        it; engine only picks the solver of the uniqueness checks.
+        """
+        start = time.perf_counter()
+        geometry = self.geometry
+        size, box = geometry.size, geometry.box
+        cells = bytearray(geometry.cell_count)
+        for k in range(box):
+            nums = list(range(1, size + 1))
+            random.shuffle(nums)
+            for j, num in enumerate(nums):
+                row, col = k * box + j // box, k * box + j % box
+                cells[row * size + col] = num
+        
+        solver = DLXSolver(bytes(cells))
+        if deadline is not None:
+            solver.time_limit = max(deadline - time.perf_counter(), 0.001)
+        try:
+            solution = solver.get_solution_cells()
+        finally:
+            self.timings['fill'] += time.perf_counter() - start
+        return bytearray(solution)
     
-    def _remove_cells(self, grid: List[List[int]], num_to_remove: int) -> List[List[int]]:
-        """Remove cells while ensuring unique solution."""
-        puzzle = [row[:] for row in grid]
-        cells = [(r, c) for r in range(9) for c in range(9)]
+    def _remove_cells(self, grid: List[List[int]], num_to_remove: int,
+                      deadline: Optional[float] = None) -> List[List[int]]:
+        """
+        Remove cells while ensuring unique solution.
+        grid must be a complete grid: it is the unique solution of every puzzle
+        on the way, so removing a clue keeps the solution unique exactly when no
+        solution puts a different digit in that cell. One solver is reused for
+        all removals and only answers that exclusion query.
+        Removal stops at the deadline (a time.perf_counter() value); a clue
+        whose check is cut short by it or by check_time_limit is kept.
+        """
+        start = time.perf_counter()
+        checking = 0.0
+        checks = 0
+        timeouts = 0
+        size = self.size
+        puzzle = bytearray(to_bytes(grid))
+        cells = list(range(len(puzzle)))
         random.shuffle(cells)
+        solver = create_solver(bytes(puzzle), self.engine)
+        solver.time_limit = self.check_time_limit
         
         removed = 0
-        for row, col in cells:
+        for index in cells:
             if removed >= num_to_remove:
                 break
+            if deadline is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                solver.time_limit = min(remaining, self.check_time_limit or remaining)
             
             # Try removing this cell
-            original = puzzle[row][col]
-            puzzle[row][col] = 0
+            row, col = divmod(index, size)
+            original = puzzle[index]
+            solver.clear_cell(row, col)
             
-            # Check if still has unique solution
-            solver = SudokuSolver(puzzle)
-            if solver.is_valid_grid():
-                solution_count = solver.count_solutions()
-                if solution_count == 1:
-                    removed += 1
-                else:
-                    # Restore if multiple solutions
-                    puzzle[row][col] = original
+            check_start = time.perf_counter()
+            try:
+                alternative = solver.has_alternative(row, col, original)
+            except SolverTimeout:
+                # Undecided: keeping the clue keeps the solution unique
+                alternative = True
+                timeouts += 1
+            checking += time.perf_counter() - check_start
+            checks += 1
+            if alternative:
+                # Restore if multiple solutions
+                solver.set_cell(row, col, original)
             else:
-                puzzle[row][col] = original
+                puzzle[index] = 0
+                removed += 1
         
-        return puzzle
+        self.timings['uniqueness'] += checking
+        self.timings['uniqueness_checks'] += checks
+        self.timings['uniqueness_timeouts'] += timeouts
+        self.timings['removal'] += time.perf_counter() - start - checking
+        return from_bytes(puzzle)
     
     def generate(self, difficulty: str = 'medium') -> Tuple[List[List[int]], List[List[int]]]:
         """
         Generate a Sudoku puzzle with specified difficulty.
         Returns (puzzle, solution) tuple.
         """
+        start = time.perf_counter()
+        self._reset_timings()
         if difficulty not in self.DIFFICULTY_SETTINGS:
             difficulty = 'medium'
+        deadline = start + self.time_budget if self.time_budget else None
         
-        min_clues, max_clues, _ = self.DIFFICULTY_SETTINGS[difficulty]
+        min_clues, max_clues = clue_range(difficulty, self.size)
         target_clues = random.randint(min_clues, max_clues)
-        num_to_remove = 81 - target_clues
+        num_to_remove = self.geometry.cell_count - target_clues
         
         # Generate complete grid
-        solution = self.generate_complete_grid()
-        
-        # Remove cells to create puzzle
-        puzzle = self._remove_cells(solution, num_to_remove)
-        
-        # Verify unique solution
-        solver = SudokuSolver(puzzle)
-        solution_count = solver.count_solutions()
-        
-        # If not unique, try again (with slightly more clues)
-        attempts = 0
-        while solution_count != 1 and attempts < 10:
-            if solution_count == 0:
-                # Invalid puzzle, regenerate
-                solution = self.generate_complete_grid()
-                puzzle = self._remove_cells(solution, num_to_remove)
-            else:
-                # Multiple solutions, add a clue back
-                empty_cells = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] == 0]
-                if empty_cells:
-                    row, col = random.choice(empty_cells)
-                    puzzle[row][col] = solution[row][col]
+        solution = from_bytes(self._fill_grid(deadline))
+        
+        # Remove cells to create puzzle; every removal keeps the solution unique
+        puzzle = self._remove_cells(solution, num_to_remove, deadline)
+        
+        self.timings['total'] = time.perf_counter() - start
+        return puzzle, solution
+    
+    def generate_graded(self, difficulty: str = 'medium',
+                        max_attempts: int = 50) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Generate a puzzle whose technique rating (see sudoku.grading) matches
+        difficulty, rather than only its clue count. Each candidate is rated
+        with early termination: the rating stops as soon as the puzzle is
+        known to need a harder technique than the difficulty allows. After
+        max_attempts, or once time_budget is spent, the candidate with the
+        closest rating is returned. Returns (puzzle, solution) tuple. Only
+        9x9 grids can be rated.
+        """
+        self._require_9x9('Graded')
+        start = time.perf_counter()
+        self._reset_timings()
+        if difficulty not in self.DIFFICULTY_SETTINGS:
+            difficulty = 'medium'
+        deadline = start + self.time_budget if self.time_budget else None
+        
+        min_clues, max_clues = self.DIFFICULTY_SETTINGS[difficulty]
+        target = GRADES.index(difficulty)
+        max_grade = difficulty if difficulty != GRADES[-1] else None
+        best = None
+        
+        for attempt in range(max_attempts):
+            if best is not None and deadline is not None and time.perf_counter() >= deadline:
+                break
+            solution = from_bytes(self._fill_grid(deadline))
+            puzzle = self._remove_cells(solution, 81 - random.randint(min_clues, max_clues), deadline)
+            grading_start = time.perf_counter()
+            rating = rate(puzzle, max_grade)
+            self.timings['grading'] += time.perf_counter() - grading_start
+            self.timings['retries'] = attempt
             
-            solver = SudokuSolver(puzzle)
-            solution_count = solver.count_solutions()
-            attempts += 1
+            if rating['status'] == 'rated':
+                distance = abs(GRADES.index(rating['grade']) - target)
+            else:
+                # 'too_hard': at least one grade above the target
+                distance = 1
+            if best is None or distance < best[0]:
+                best = (distance, puzzle, solution)
+            if distance == 0:
+                break
+        puzzle, solution = best[1], best[2]
+        
+        self.timings['total'] = time.perf_counter() - start
+        return puzzle, solution
+    
+    def generate_from_seeds(self, difficulty: str = 'medium') -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Generate a puzzle by applying a random symmetry transform to a verified
+        seed puzzle of the difficulty (see sudoku.seeds). No solving is needed,
+        so this takes microseconds; the puzzles are only as varied as the seed
+        library. Returns (puzzle, solution) tuple. The seeds are 9x9 puzzles.
+        """
+        from .seeds import get_library
         
-        if solution_count != 1:
-            # Fallback: return puzzle with more clues
-            puzzle = self._remove_cells(solution, 81 - max_clues)
+        self._require_9x9('Seed')
+        start = time.perf_counter()
+        self._reset_timings()
+        if difficulty not in self.DIFFICULTY_SETTINGS:
+            difficulty = 'medium'
         
+        puzzle, solution = random.choice(get_library()[difficulty])
+        transform_start = time.perf_counter()
+        transform = random_transform()
+        puzzle, solution = from_bytes(transform.apply(puzzle)), from_bytes(transform.apply(solution))
+        
+        now = time.perf_counter()
+        self.timings['transform'] = now - transform_start
+        self.timings['total'] = now - start
         return puzzle, solution
+
+
+def clue_range(difficulty: str, size: int = 9) -> Tuple[int, int]:
+    """
+    (min_clues, max_clues) of difficulty for size x size grids: the 9x9
+    range scaled by the number of cells.
+    """
+    min_clues, max_clues = SudokuGenerator.DIFFICULTY_SETTINGS[difficulty]
+    if size == 9:
+        return min_clues, max_clues
+    scale = size * size / 81
+    return round(min_clues * scale), round(max_clues * scale)
+
+
+def clue_difficulty(puzzle: Grid) -> str:
+    """
+    The difficulty a puzzle's clue count reaches: the hardest one whose clue
+    range (scaled to the grid size) allows that many clues, or 'easy' when
+    it has more clues than any range. Search generation stops short of the
+    target when the puzzle becomes minimal or the time budget runs out, so
+    this can be easier than the difficulty asked for.
+    """
+    clues = sum(1 for row in puzzle for num in row if num)
+    for difficulty in reversed(list(SudokuGenerator.DIFFICULTY_SETTINGS)):
+        if clues <= clue_range(difficulty, len(puzzle))[1]:
+            return difficulty
+    return 'easy'
@@ -0,0 +1,87 @@
+"""
+Cell and unit tables of the supported grid sizes.
+
+An N x N grid (N = box * box) has N rows, N columns and N boxes of
+box x box cells, and digits 1..N kept as N-bit masks (bit d - 1 for digit
+d). Cells are numbered row by row (row * N + col). The tables are built
+once per size and shared by every solver of that size.
+"""
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .grid import GRID_SIZES
+
+try:
+    popcount = int.bit_count  # Number of set bits of a mask (Python 3.10+)
+except AttributeError:  # pragma: no cover
+    def popcount(mask: int) -> int:
+        return bin(mask).count('1')
+
+
+class Geometry:
+    """Lookup tables for the N x N grid with box x box boxes."""
+
+    __slots__ = (
+        'box', 'size', 'cell_count', 'all_digits', 'digit_bits',
+        'row_of', 'col_of', 'box_of', 'cell_units', 'units', 'peers',
+        'line_outside_box', 'box_outside_line',
+    )
+
+    def __init__(self, box: int):
+        size = box * box
+        cell_count = size * size
+        self.box = box
+        self.size = size
+        self.cell_count = cell_count
+        # Mask with all N digit bits set
+        self.all_digits = (1 << size) - 1
+        # digit_bits[num] is the mask bit for num (index 0 = empty cell)
+        self.digit_bits = [0] + [1 << (num - 1) for num in range(1, size + 1)]
+
+        # Row, column and box of every flat cell index
+        self.row_of = [i // size for i in range(cell_count)]
+        self.col_of = [i % size for i in range(cell_count)]
+        self.box_of = [(i // (size * box)) * box + (i % size) // box for i in range(cell_count)]
+        # (cell, row, column, box) of every flat cell index
+        self.cell_units = tuple(zip(range(cell_count), self.row_of, self.col_of, self.box_of))
+
+        # Cell indexes of the 3N units: rows, then columns, then boxes
+        box_cells: List[List[int]] = [[] for _ in range(size)]
+        for i in range(cell_count):
+            box_cells[self.box_of[i]].append(i)
+        self.units = (
+            [[row * size + col for col in range(size)] for row in range(size)]
+            + [[row * size + col for row in range(size)] for col in range(size)]
+            + box_cells
+        )
+
+        # The cells sharing a row, column or box with every flat cell index
+        self.peers = [
+            sorted({
+                j for unit in (self.row_of[i], size + self.col_of[i], 2 * size + self.box_of[i])
+                for j in self.units[unit]
+            } - {i})
+            for i in range(cell_count)
+        ]
+
+        # For pointing / box-line reductions: the cells of a line outside a box
+        # and the cells of a box outside a line, keyed by (line unit, box)
+        self.line_outside_box: Dict[Tuple[int, int], List[int]] = {}
+        self.box_outside_line: Dict[Tuple[int, int], List[int]] = {}
+        for line in range(2 * size):
+            line_cells = self.units[line]
+            for box_index in sorted({self.box_of[i] for i in line_cells}):
+                self.line_outside_box[(line, box_index)] = [
+                    i for i in line_cells if self.box_of[i] != box_index
+                ]
+                self.box_outside_line[(line, box_index)] = [
+                    i for i in box_cells[box_index] if i not in line_cells
+                ]
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size: int = 9) -> Geometry:
+    """The shared tables of the size x size grid (9, 16 or 25)."""
+    if size not in GRID_SIZES:
+        raise ValueError(f"Unsupported grid size {size} (expected one of {GRID_SIZES})")
+    return Geometry(int(round(size ** 0.5)))
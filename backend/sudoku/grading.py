@@ -0,0 +1,107 @@
+"""
+Difficulty grading by solving technique instead of clue count.
+
+A puzzle is rated by the hardest deduction SudokuSolver.propagate() needs
+to solve it without guessing, easiest techniques first:
+
+    easy    naked singles only
+    medium  hidden singles
+    hard    naked/hidden pairs or pointing/box-line reductions
+    expert  no deduction chain solves it; the search has to guess
+
+The search effort (branches and propagation steps of the instrumented
+solve) is reported alongside, so puzzles within a grade can be ranked.
+Rating is a single propagation pass for most puzzles, a few hundred
+microseconds each; rate_batch spreads large batches over processes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+from .grid import Grid
+from .solver import TECHNIQUES, SudokuSolver
+
+GRADES = ('easy', 'medium', 'hard', 'expert')
+
+# Hardest technique (index into TECHNIQUES) each grade may need
+GRADE_LEVELS = {
+    'easy': TECHNIQUES.index('naked_single'),
+    'medium': TECHNIQUES.index('hidden_single'),
+    'hard': len(TECHNIQUES) - 1,
+}
+
+
+def _grade_of(level: int) -> str:
+    """Easiest grade whose techniques cover level."""
+    for grade, max_level in GRADE_LEVELS.items():
+        if level <= max_level:
+            return grade
+    return 'expert'
+
+
+def rate(grid: Union[Grid, str, bytes], max_grade: Optional[str] = None) -> Dict:
+    """
+    Rate a puzzle. Returns a dict with a 'status' of 'rated', 'too_hard',
+    'invalid' or 'unsolvable'; rated puzzles have 'grade', 'technique'
+    (the hardest technique used, 'search' if guessing was needed, None if
+    no deduction was needed), 'branches' and 'propagations'.
+
+    With max_grade, rating stops as soon as the puzzle is known to be
+    harder (status 'too_hard'), which skips the search entirely.
+    Uniqueness is not checked.
+    """
+    solver = SudokuSolver(grid)
+    if solver.has_conflict:
+        return {'status': 'invalid'}
+
+    max_level = GRADE_LEVELS.get(max_grade) if max_grade is not None else None
+    if not solver.propagate(max_level):
+        return {'status': 'unsolvable'}
+    if solver.cells.count(0) == 0:
+        return {
+            'status': 'rated',
+            'grade': _grade_of(solver.hardest),
+            'technique': TECHNIQUES[solver.hardest] if solver.hardest >= 0 else None,
+            'branches': 0,
+            'propagations': solver.propagations,
+        }
+    if max_level is not None:
+        return {'status': 'too_hard'}
+
+    # Deductions got stuck: continue with the search from this state
+    propagations = solver.propagations
+    if not solver.solve():
+        return {'status': 'unsolvable'}
+    return {
+        'status': 'rated',
+        'grade': 'expert',
+        'technique': 'search',
+        'branches': solver.branches,
+        'propagations': propagations + solver.propagations,
+    }
+
+
+def rate_many(grids: List[Union[Grid, str, bytes]], max_grade: Optional[str] = None) -> List[Dict]:
+    """Rate a list of puzzles in this process."""
+    return [rate(grid, max_grade) for grid in grids]
+
+
+def rate_batch(grids: Iterable[Union[Grid, str, bytes]], workers: Optional[int] = None,
+               chunk_size: int = 256, max_grade: Optional[str] = None) -> List[Dict]:
+    """
+    Rate many puzzles, in input order. workers defaults to the CPU count;
+    workers=0 rates in this process. Grids are sent to the workers in
+    chunks to amortize process overhead.
+    """
+    grids = list(grids)
+    chunks = [grids[i:i + chunk_size] for i in range(0, len(grids), chunk_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 0 or len(chunks) <= 1:
+        return rate_many(grids, max_grade)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        results = executor.map(rate_many, chunks, [max_grade] * len(chunks))
+        return [rating for chunk in results for rating in chunk]
+
@@ -0,0 +1,109 @@
+"""
+Conversions between grid formats.
+
+Internally the solvers use a compact flat form: N * N bytes holding the
+cell values row by row (0 = empty), 81 bytes for the classic 9x9 grid. The
+API and callers may also use the nested list form or the string notation
+of N * N characters, where '.' or '0' marks an empty cell, e.g.
+"53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79".
+16x16 and 25x25 grids write the values 10-25 as the letters A-P.
+"""
+from typing import List, Union
+
+Grid = List[List[int]]
+
+# Side lengths of the supported grids (boxes of 3x3, 4x4 and 5x5 cells)
+GRID_SIZES = (9, 16, 25)
+
+# Characters of the cell values in string notation (index = value)
+DIGIT_CHARS = '0123456789ABCDEFGHIJKLMNOP'
+
+# Translation tables between characters and cell values; characters that
+# are not digits or letters of DIGIT_CHARS map to 255 (invalid)
+_ASCII_TO_VALUE = bytes(
+    DIGIT_CHARS.find(chr(c).upper()) if chr(c).upper() in DIGIT_CHARS else 255
+    for c in range(256)
+)
+_VALUE_TO_ASCII = bytes.maketrans(bytes(range(len(DIGIT_CHARS))), DIGIT_CHARS.encode())
+_EMPTY_TO_ZERO = str.maketrans('.', '0')
+
+_SIZE_OF_CELL_COUNT = {size * size: size for size in GRID_SIZES}
+
+
+def _one_of(values) -> str:
+    """'a, b or c' for error messages."""
+    values = [str(value) for value in values]
+    return ', '.join(values[:-1]) + ' or ' + values[-1]
+
+
+def grid_size(cell_count: int) -> int:
+    """Side length of a grid with cell_count cells; ValueError if unsupported."""
+    try:
+        return _SIZE_OF_CELL_COUNT[cell_count]
+    except KeyError:
+        raise ValueError(f"Grid must have {_one_of(_SIZE_OF_CELL_COUNT)} cells")
+
+
+def string_to_bytes(text: str) -> bytes:
+    """Parse string notation (81, 256 or 625 characters) into cell bytes."""
+    text = text.strip()
+    if len(text) not in _SIZE_OF_CELL_COUNT:
+        raise ValueError(f"Grid string must have {_one_of(_SIZE_OF_CELL_COUNT)} characters")
+    size = _SIZE_OF_CELL_COUNT[len(text)]
+    cells = text.translate(_EMPTY_TO_ZERO).encode('ascii', errors='replace').translate(_ASCII_TO_VALUE)
+    if max(cells) > size:
+        raise ValueError(f"Grid string may only contain '.' and the values 0-{DIGIT_CHARS[size]}")
+    return cells
+
+
+def bytes_to_string(cells: bytes, empty: str = '.') -> str:
+    """Format cell bytes in string notation."""
+    text = bytes(cells).translate(_VALUE_TO_ASCII).decode('ascii')
+    return text.replace('0', empty) if empty != '0' else text
+
+
+def to_bytes(grid: Grid) -> bytes:
+    """Flatten a grid given as rows into cell bytes."""
+    validate_grid(grid)
+    return bytes([num for row in grid for num in row])
+
+
+def from_bytes(cells: bytes) -> Grid:
+    """Expand cell bytes into a list of rows."""
+    size = grid_size(len(cells))
+    return [list(cells[row * size:row * size + size]) for row in range(size)]
+
+
+def from_string(text: str) -> Grid:
+    """Parse string notation into a list of rows."""
+    return from_bytes(string_to_bytes(text))
+
+
+def to_string(grid: Grid, empty: str = '.') -> str:
+    """Format a grid given as rows in string notation."""
+    return bytes_to_string(to_bytes(grid), empty)
+
+
+def to_cells(value: Union[Grid, str, bytes]) -> bytearray:
+    """Convert any supported grid format into a mutable cell byte array."""
+    if isinstance(value, str):
+        return bytearray(string_to_bytes(value))
+    if isinstance(value, (bytes, bytearray)):
+        size = _SIZE_OF_CELL_COUNT.get(len(value))
+        if size is None or max(value) > size:
+            raise ValueError(f"Grid bytes must be N * N values 0-N for N = {_one_of(GRID_SIZES)}")
+        return bytearray(value)
+    return bytearray(to_bytes(value))
+
+
+def validate_grid(grid: Grid) -> None:
+    """Raise ValueError if grid is not an N x N list of integers 0-N (N = 9, 16 or 25)."""
+    size = len(grid)
+    if size not in GRID_SIZES:
+        raise ValueError(f"Grid must have {_one_of(GRID_SIZES)} rows")
+    for row in grid:
+        if len(row) != size:
+            raise ValueError(f"Each row must have {size} columns")
+        for cell in row:
+            if not isinstance(cell, int) or cell < 0 or cell > size:
+                raise ValueError(f"Cells must be integers 0-{size}")
@@ -0,0 +1,144 @@
+"""
+Pool of pre-generated puzzles per difficulty, refilled by a background thread.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .generator import SudokuGenerator
+
+Puzzle = Tuple[List[List[int]], List[List[int]]]
+
+
+class PuzzlePool:
+    """
+    Keeps up to target_size ready (puzzle, solution) pairs per difficulty so a
+    request is served with an O(1) pop. When a pool drops to low_water the
+    background worker tops every pool back up to target_size; an empty pool
+    falls back to synchronous generation.
+
+    generate(difficulty) produces the puzzles; it defaults to a
+    SudokuGenerator and can be replaced to generate in worker processes.
+    """
+
+    def __init__(self, target_size: int = 20, low_water: int = 5,
+                 difficulties: Optional[List[str]] = None,
+                 generate: Optional[Callable[[str], Puzzle]] = None):
+        if target_size < 1:
+            raise ValueError("target_size must be at least 1")
+        if not 0 <= low_water < target_size:
+            raise ValueError("low_water must be between 0 and target_size - 1")
+
+        self.target_size = target_size
+        self.low_water = low_water
+        self.generate = generate or SudokuGenerator().generate
+        difficulties = difficulties or list(SudokuGenerator.DIFFICULTY_SETTINGS)
+
+        self._pools: Dict[str, deque] = {d: deque() for d in difficulties}
+        self._stats = {
+            d: {'served': 0, 'fallbacks': 0, 'generated': 0, 'generation_seconds': 0.0}
+            for d in difficulties
+        }
+        self._lock = threading.Lock()
+        self._refill_needed = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background worker and fill every pool to target_size."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="puzzle-pool", daemon=True)
+        self._thread.start()
+        self._refill_needed.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background worker (after the puzzle being generated, if any)."""
+        self._stopping.set()
+        self._refill_needed.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get(self, difficulty: str) -> Puzzle:
+        """
+        Take a (puzzle, solution) pair for difficulty from the pool, generating
+        one synchronously if the pool is empty. Unknown difficulties are served
+        as 'medium', like SudokuGenerator.generate.
+        """
+        item = self.try_get(difficulty)
+        if item is None:
+            item = self.generate(self._normalize(difficulty))
+        return item
+
+    def try_get(self, difficulty: str) -> Optional[Puzzle]:
+        """Like get(), but return None instead of generating when the pool is empty."""
+        difficulty = self._normalize(difficulty)
+
+        with self._lock:
+            pool = self._pools[difficulty]
+            item = pool.popleft() if pool else None
+            depth = len(pool)
+            self._stats[difficulty]['served' if item else 'fallbacks'] += 1
+
+        if depth <= self.low_water:
+            self._refill_needed.set()
+        return item
+
+    def _normalize(self, difficulty: str) -> str:
+        """Map unknown difficulties to 'medium'."""
+        return difficulty if difficulty in self._pools else 'medium'
+
+    def _next_to_refill(self) -> Optional[str]:
+        """Difficulty with the emptiest pool that is below target_size."""
+        with self._lock:
+            candidates = [(len(pool), d) for d, pool in self._pools.items()
+                          if len(pool) < self.target_size]
+        return min(candidates)[1] if candidates else None
+
+    def _run(self) -> None:
+        """Worker loop: wait for a refill request, then top up every pool."""
+        while not self._stopping.is_set():
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+
+            while not self._stopping.is_set():
+                difficulty = self._next_to_refill()
+                if difficulty is None:
+                    break
+                start = time.perf_counter()
+                try:
+                    item = self.generate(difficulty)
+                except Exception as e:
+                    # Leave the pool as is; the next get() retries the refill
+                    print(f"Puzzle pool refill error: {e}")
+                    break
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._pools[difficulty].append(item)
+                    stats = self._stats[difficulty]
+                    stats['generated'] += 1
+                    stats['generation_seconds'] += elapsed
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Pool depth and counters per difficulty. refill_rate is puzzles generated
+        per second of worker time, i.e. the sustainable serving rate of the pool.
+        """
+        with self._lock:
+            result = {}
+            for difficulty, pool in self._pools.items():
+                stats = self._stats[difficulty]
+                seconds = stats['generation_seconds']
+                result[difficulty] = {
+                    'depth': len(pool),
+                    'target_size': self.target_size,
+                    'low_water': self.low_water,
+                    'served': stats['served'],
+                    'fallbacks': stats['fallbacks'],
+                    'generated': stats['generated'],
+                    'refill_rate': round(stats['generated'] / seconds, 2) if seconds else None,
+                }
+            return result
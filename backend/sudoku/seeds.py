@@ -0,0 +1,134 @@
+"""
+Library of verified seed puzzles for pattern-based generation.
+
+Each difficulty has a list of (puzzle, solution) pairs stored as 81-character
+strings in seeds.json next to this module. A random symmetry transform of a
+seed is again a unique puzzle with the same clue count and technique rating
+(see sudoku.grading), so SudokuGenerator.generate_from_seeds() can produce
+a fresh-looking puzzle without any search.
+
+Build or check the library offline from the backend directory:
+    python -m sudoku.seeds --count 64
+    python -m sudoku.seeds --verify
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .engines import DEFAULT_ENGINE, create_solver
+from .generator import SudokuGenerator
+from .grading import rate
+from .grid import bytes_to_string, string_to_bytes, to_bytes
+
+SEEDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seeds.json')
+
+# (puzzle, solution) as 81 cell bytes each
+Seed = Tuple[bytes, bytes]
+
+_library: Optional[Dict[str, List[Seed]]] = None
+
+
+def load_seeds(path: str = SEEDS_PATH) -> Dict[str, List[Seed]]:
+    """Read a seed library written by save_seeds()."""
+    with open(path) as f:
+        data = json.load(f)
+    return {
+        difficulty: [(string_to_bytes(puzzle), string_to_bytes(solution))
+                     for puzzle, solution in seeds]
+        for difficulty, seeds in data.items()
+    }
+
+
+def save_seeds(library: Dict[str, List[Seed]], path: str = SEEDS_PATH) -> None:
+    """Write a seed library as JSON, one [puzzle, solution] string pair per seed."""
+    sections = []
+    for difficulty, seeds in library.items():
+        lines = ',\n'.join(
+            f'  {json.dumps([bytes_to_string(puzzle), bytes_to_string(solution)])}'
+            for puzzle, solution in seeds
+        )
+        sections.append(f'{json.dumps(difficulty)}: [\n{lines}\n ]')
+    with open(path, 'w') as f:
+        f.write('{\n ' + ',\n '.join(sections) + '\n}\n')
+
+
+def get_library() -> Dict[str, List[Seed]]:
+    """The bundled seed library, loaded once per process."""
+    global _library
+    if _library is None:
+        _library = load_seeds()
+    return _library
+
+
+def verify_seed(difficulty: str, puzzle: bytes, solution: bytes,
+                engine: str = DEFAULT_ENGINE) -> Optional[str]:
+    """
+    Check one seed; returns None if it is valid, otherwise the reason.
+    A valid seed has exactly one solution, that solution is the stored one
+    and its technique rating is the difficulty (ratings are invariant under
+    the symmetry transforms, so every generated puzzle keeps it).
+    """
+    solver = create_solver(puzzle, engine)
+    if not solver.is_valid_grid():
+        return "givens conflict"
+    count = solver.count_solutions(2)
+    if count != 1:
+        return "no solution" if count == 0 else "multiple solutions"
+    if solver.solutions[0] != solution:
+        return "stored solution does not match"
+    grade = rate(puzzle)['grade']
+    if grade != difficulty:
+        return f"rated {grade}"
+    return None
+
+
+def build_seeds(count: int, engine: str = DEFAULT_ENGINE) -> Dict[str, List[Seed]]:
+    """
+    Generate and verify count seeds per difficulty with SudokuGenerator,
+    keeping only puzzles whose technique rating matches the difficulty.
+    """
+    generator = SudokuGenerator(engine)
+    library = {}
+    for difficulty in SudokuGenerator.DIFFICULTY_SETTINGS:
+        seeds = []
+        while len(seeds) < count:
+            puzzle, solution = generator.generate_graded(difficulty)
+            seed = (to_bytes(puzzle), to_bytes(solution))
+            if verify_seed(difficulty, *seed, engine=engine) is None:
+                seeds.append(seed)
+        library[difficulty] = seeds
+    return library
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=64, help='seeds per difficulty')
+    parser.add_argument('--path', default=SEEDS_PATH, help='library file to write or verify')
+    parser.add_argument('--engine', default=DEFAULT_ENGINE, help='solver engine for the checks')
+    parser.add_argument('--verify', action='store_true',
+                        help='only verify the existing library')
+    args = parser.parse_args()
+
+    if args.verify:
+        library = load_seeds(args.path)
+        failures = 0
+        for difficulty, seeds in library.items():
+            for index, seed in enumerate(seeds):
+                reason = verify_seed(difficulty, *seed, engine=args.engine)
+                if reason is not None:
+                    failures += 1
+                    print(f"{difficulty} #{index}: {reason}")
+            print(f"{difficulty}: {len(seeds)} seeds checked")
+        raise SystemExit(1 if failures else 0)
+
+    start = time.perf_counter()
+    library = build_seeds(args.count, args.engine)
+    save_seeds(library, args.path)
+    print(f"Wrote {args.count} seeds per difficulty to {args.path} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
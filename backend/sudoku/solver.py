@@ -1,126 +1,563 @@
 """
 Sudoku solver using backtracking with constraint propagation and MRV heuristic.
+
+Row, column and box occupancy is kept as N-bit digit masks that are updated
+incrementally when a digit is placed or removed, so looking up the candidates
+of a cell is a few bitwise operations instead of a rescan of the grid. The
+solver takes 9x9, 16x16 and 25x25 grids; the tables of each size come from
+sudoku.geometry.
 """
-from typing import Optional, List, Tuple
-import copy
+import time
+from typing import Dict, Iterator, Optional, List, Tuple, Union
+
+from .geometry import get_geometry, popcount
+from .grid import Grid, from_bytes, grid_size, to_cells
+
+# Units of the 9x9 grid, imported by ocr.repair; the solver itself takes its
+# tables from sudoku.geometry for any size
+_GEOMETRY = get_geometry(9)
+
+# Cell indexes of the 27 units: rows 0-8, columns 9-17, boxes 18-26
+UNITS = _GEOMETRY.units
+
+
+# Deduction techniques applied by propagate(), easiest first
+TECHNIQUES = ('naked_single', 'hidden_single', 'naked_pair', 'hidden_pair', 'pointing')
+
+
+class SolverTimeout(Exception):
+    """Raised when a search runs longer than the solver's time_limit."""
 
 
 class SudokuSolver:
     """Solves Sudoku puzzles using backtracking with optimization techniques."""
-    
-    def __init__(self, grid: List[List[int]]):
+
+    __slots__ = (
+        'cells', 'geometry', 'rows', 'cols', 'boxes', 'eliminated', 'has_conflict',
+        'solutions', 'max_solutions', 'use_propagation', 'time_limit',
+        'propagations', 'branches', 'hardest', 'collect_stats',
+        'backtracks', 'max_depth', 'candidate_computations', 'elapsed',
+        '_placed_trail', '_eliminated_trail', '_nodes',
+    )
+
+    def __init__(self, grid: Union[Grid, str, bytes], use_propagation: bool = True):
         """
-        Initialize solver with a 9x9 grid.
-        Grid should be a list of 9 lists, each containing 9 integers (0-9, 0 = empty).
+        Initialize solver with a 9x9, 16x16 or 25x25 grid.
+        Grid should be a list of N lists, each containing N integers (0-N, 0 = empty),
+        or the same puzzle in string notation or as N * N cell bytes.
+        With use_propagation, forced deductions are applied at every search node
+        before branching.
         """
-        self.grid = copy.deepcopy(grid)
-        self.solutions = []
+        # Flat cell values, row by row
+        self.cells = to_cells(grid)
+        self.geometry = geometry = get_geometry(grid_size(len(self.cells)))
+        self.solutions = []  # Solutions of the last search, as cell bytes
         self.max_solutions = 2  # Stop after finding 2 solutions
-    
-    def is_valid(self, row: int, col: int, num: int) -> bool:
-        """Check if placing num at (row, col) is valid."""
-        # Check row
-        for c in range(9):
-            if self.grid[row][c] == num:
-                return False
-        
-        # Check column
-        for r in range(9):
-            if self.grid[r][col] == num:
+        self.use_propagation = use_propagation
+        self.time_limit = None  # Seconds allowed per search (None = unlimited)
+        self._nodes = 0
+
+        # Search statistics of the last solve
+        self.propagations = 0  # Digits placed or candidates removed by deduction
+        self.branches = 0  # Cells where the search had to guess
+        self.hardest = -1  # Index in TECHNIQUES of the hardest deduction made
+
+        # Extra counters of the last search, kept when collect_stats is set
+        # (see search_stats)
+        self.collect_stats = False
+        self.backtracks = 0  # Dead ends: nodes where a contradiction forced a step back
+        self.max_depth = 0  # Most guesses (cells with several candidates) on one search path
+        self.candidate_computations = 0  # Candidate scans of the whole grid
+        self.elapsed = 0.0  # Wall time of the search in seconds
+
+        # Per-unit digit masks
+        self.rows = [0] * geometry.size
+        self.cols = [0] * geometry.size
+        self.boxes = [0] * geometry.size
+        self.has_conflict = False
+
+        # Candidates removed by pair / pointing deductions, per cell
+        self.eliminated = [0] * geometry.cell_count
+        # Undo logs: cells placed and (cell, previous elimination mask)
+        self._placed_trail = []
+        self._eliminated_trail = []
+
+        digit_bits = geometry.digit_bits
+        for i, r, c, b in geometry.cell_units:
+            num = self.cells[i]
+            if num:
+                bit = digit_bits[num]
+                if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+                    self.has_conflict = True
+                self.rows[r] |= bit
+                self.cols[c] |= bit
+                self.boxes[b] |= bit
+
+    def place(self, index: int, num: int) -> None:
+        """Place num in the flat cell index and update the unit masks."""
+        _, row, col, box = self.geometry.cell_units[index]
+        bit = 1 << (num - 1)
+        self.cells[index] = num
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[box] |= bit
+
+    def unplace(self, index: int) -> None:
+        """Clear the flat cell index and update the unit masks."""
+        _, row, col, box = self.geometry.cell_units[index]
+        bit = ~(1 << (self.cells[index] - 1))
+        self.cells[index] = 0
+        self.rows[row] &= bit
+        self.cols[col] &= bit
+        self.boxes[box] &= bit
+
+    def candidate_mask(self, index: int) -> int:
+        """Get the bitmask of digits that can go in the flat cell index."""
+        _, row, col, box = self.geometry.cell_units[index]
+        return self.geometry.all_digits & ~(
+            self.rows[row] | self.cols[col] | self.boxes[box] | self.eliminated[index]
+        )
+
+    def _candidate_masks(self) -> List[int]:
+        """Candidate masks of all cells in one pass (0 for filled cells)."""
+        self.candidate_computations += 1
+        cells = self.cells
+        rows, cols, boxes, eliminated = self.rows, self.cols, self.boxes, self.eliminated
+        all_digits = self.geometry.all_digits
+        return [
+            0 if cells[i] else all_digits & ~(rows[r] | cols[c] | boxes[b] | eliminated[i])
+            for i, r, c, b in self.geometry.cell_units
+        ]
+
+    def _assign(self, index: int, num: int) -> None:
+        """Place num during search, recording it for undo."""
+        self.place(index, num)
+        self._placed_trail.append(index)
+
+    def _eliminate(self, index: int, bits: int) -> bool:
+        """Remove candidate bits from a cell, recording it for undo."""
+        if not self.candidate_mask(index) & bits:
+            return False
+        self._eliminated_trail.append((index, self.eliminated[index]))
+        self.eliminated[index] |= bits
+        return True
+
+    def _mark(self) -> Tuple[int, int]:
+        """Current position of the undo logs."""
+        return len(self._placed_trail), len(self._eliminated_trail)
+
+    def _undo(self, mark: Tuple[int, int]) -> None:
+        """Revert every placement and elimination made since mark."""
+        placed_mark, eliminated_mark = mark
+        placed_trail = self._placed_trail
+        while len(placed_trail) > placed_mark:
+            self.unplace(placed_trail.pop())
+        eliminated_trail = self._eliminated_trail
+        while len(eliminated_trail) > eliminated_mark:
+            index, previous = eliminated_trail.pop()
+            self.eliminated[index] = previous
+
+    def propagate(self, max_level: Optional[int] = None) -> bool:
+        """
+        Apply naked/hidden singles, naked/hidden pairs and pointing/box-line
+        reductions until none of them makes progress. Cheaper techniques are
+        retried first whenever a harder one changes the candidates, so
+        self.hardest ends up as the hardest technique the puzzle needs.
+        max_level limits the techniques to TECHNIQUES[:max_level + 1].
+        Returns False if a contradiction is found.
+        """
+        techniques = (
+            self._naked_singles,
+            self._hidden_singles,
+            self._naked_pairs,
+            self._hidden_pairs,
+            self._pointing,
+        )
+        if max_level is not None:
+            techniques = techniques[:max_level + 1]
+        level = 0
+        while level < len(techniques):
+            changes = techniques[level]()
+            if changes < 0:
                 return False
-        
-        # Check 3x3 box
-        box_row = (row // 3) * 3
-        box_col = (col // 3) * 3
-        for r in range(box_row, box_row + 3):
-            for c in range(box_col, box_col + 3):
-                if self.grid[r][c] == num:
-                    return False
-        
+            if changes:
+                self.propagations += changes
+                if level > self.hardest:
+                    self.hardest = level
+                level = 0
+            else:
+                level += 1
         return True
-    
+
+    def _naked_singles(self) -> int:
+        """Place cells with a single candidate. Returns changes, or -1 on contradiction."""
+        cells = self.cells
+        rows, cols, boxes, eliminated = self.rows, self.cols, self.boxes, self.eliminated
+        all_digits = self.geometry.all_digits
+        changes = 0
+        for i, r, c, b in self.geometry.cell_units:
+            if cells[i] == 0:
+                mask = all_digits & ~(rows[r] | cols[c] | boxes[b] | eliminated[i])
+                if not mask:
+                    return -1
+                if not mask & (mask - 1):
+                    self._assign(i, mask.bit_length())
+                    changes += 1
+        return changes
+
+    def _hidden_singles(self) -> int:
+        """Place digits that fit only one cell of a unit. Returns changes, or -1 on contradiction."""
+        cells = self.cells
+        masks = self._candidate_masks()
+        geometry = self.geometry
+        digit_bits, all_digits, peers = geometry.digit_bits, geometry.all_digits, geometry.peers
+        changes = 0
+        for unit in geometry.units:
+            placed = once = twice = 0
+            for i in unit:
+                if cells[i]:
+                    placed |= digit_bits[cells[i]]
+                else:
+                    mask = masks[i]
+                    twice |= once & mask
+                    once |= mask
+            if (once | placed) != all_digits:
+                return -1  # Some digit has nowhere to go
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for i in unit:
+                    if cells[i] == 0 and masks[i] & bit:
+                        self._assign(i, bit.bit_length())
+                        changes += 1
+                        # The digit is no longer a candidate of any peer
+                        masks[i] = 0
+                        for j in peers[i]:
+                            masks[j] &= ~bit
+                        break
+                else:
+                    return -1
+        return changes
+
+    def _naked_pairs(self) -> int:
+        """Two cells of a unit sharing the same two candidates clear them from the rest."""
+        cells = self.cells
+        masks = self._candidate_masks()
+        changes = 0
+        for unit in self.geometry.units:
+            pairs = {}
+            for i in unit:
+                mask = masks[i]
+                if popcount(mask) == 2:
+                    if mask in pairs:
+                        first = pairs[mask]
+                        for j in unit:
+                            if j != i and j != first and masks[j] & mask:
+                                changes += self._eliminate(j, mask)
+                                masks[j] &= ~mask
+                    else:
+                        pairs[mask] = i
+        return changes
+
+    def _hidden_pairs(self) -> int:
+        """Two digits confined to the same two cells of a unit clear other candidates there."""
+        masks = self._candidate_masks()
+        geometry = self.geometry
+        size, digit_bits, all_digits = geometry.size, geometry.digit_bits, geometry.all_digits
+        changes = 0
+        for unit in geometry.units:
+            positions = [0] * (size + 1)
+            for k, i in enumerate(unit):
+                mask = masks[i]
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    positions[bit.bit_length()] |= 1 << k
+            seen = {}
+            for num in range(1, size + 1):
+                where = positions[num]
+                if popcount(where) == 2:
+                    if where in seen:
+                        keep = digit_bits[num] | digit_bits[seen[where]]
+                        while where:
+                            bit = where & -where
+                            where ^= bit
+                            i = unit[bit.bit_length() - 1]
+                            changes += self._eliminate(i, all_digits ^ keep)
+                            masks[i] &= keep
+                    else:
+                        seen[where] = num
+        return changes
+
+    def _pointing(self) -> int:
+        """
+        Pointing: a digit confined to one line within a box is cleared from the
+        rest of that line. Box-line: a digit confined to one box within a line is
+        cleared from the rest of that box.
+        """
+        masks = self._candidate_masks()
+        geometry = self.geometry
+        units, box_of = geometry.units, geometry.box_of
+        changes = 0
+        for (line, box), outside_box in geometry.line_outside_box.items():
+            outside_line = geometry.box_outside_line[(line, box)]
+            in_both = 0
+            for i in units[line]:
+                if box_of[i] == box:
+                    in_both |= masks[i]
+            if not in_both:
+                continue
+            line_rest = box_rest = 0
+            for i in outside_box:
+                line_rest |= masks[i]
+            for i in outside_line:
+                box_rest |= masks[i]
+            # Digits of the intersection missing from the rest of the box
+            pointing = in_both & ~box_rest
+            if pointing & line_rest:
+                for i in outside_box:
+                    if masks[i] & pointing:
+                        changes += self._eliminate(i, pointing)
+                        masks[i] &= ~pointing
+            # Digits of the intersection missing from the rest of the line
+            claiming = in_both & ~line_rest
+            if claiming & box_rest:
+                for i in outside_line:
+                    if masks[i] & claiming:
+                        changes += self._eliminate(i, claiming)
+                        masks[i] &= ~claiming
+        return changes
+
+    def is_valid(self, row: int, col: int, num: int) -> bool:
+        """Check if placing num at (row, col) is valid."""
+        return bool(self.candidate_mask(row * self.geometry.size + col) & self.geometry.digit_bits[num])
+
     def get_candidates(self, row: int, col: int) -> List[int]:
         """Get valid candidates for a cell using constraint propagation."""
-        candidates = []
-        for num in range(1, 10):
-            if self.is_valid(row, col, num):
-                candidates.append(num)
-        return candidates
-    
+        mask = self.candidate_mask(row * self.geometry.size + col)
+        return [num for num in range(1, self.geometry.size + 1) if mask >> (num - 1) & 1]
+
     def find_mrv_cell(self) -> Optional[Tuple[int, int]]:
         """
         Find cell with Minimum Remaining Values (MRV) heuristic.
-        Returns (row, col) of cell with fewest candidates, or None if grid is complete.
-        """
-        min_candidates = 10
-        best_cell = None
-        
-        for row in range(9):
-            for col in range(9):
-                if self.grid[row][col] == 0:
-                    candidates = self.get_candidates(row, col)
-                    if len(candidates) == 0:
-                        return None  # Invalid state
-                    if len(candidates) < min_candidates:
-                        min_candidates = len(candidates)
-                        best_cell = (row, col)
-        
-        return best_cell
-    
+        Returns (row, col) of cell with fewest candidates, or None if grid is complete
+        or some empty cell has no candidates left.
+        """
+        index, mask = self._select_cell()
+        if index < 0 or not mask:
+            return None
+        return divmod(index, self.geometry.size)
+
+    def _select_cell(self, floor: int = 1) -> Tuple[int, int]:
+        """
+        Pick the empty cell with the fewest candidates.
+        Returns (index, candidate_mask); index is -1 when the grid is complete
+        and the mask is 0 when the chosen cell is a dead end.
+
+        A linear scan that keeps the best cell so far and stops early at the
+        first cell with floor candidates, the fewest that can occur (2 right
+        after propagation, which leaves no cell with fewer); on large grids
+        such a cell usually comes long before the end of the grid.
+        """
+        self.candidate_computations += 1
+        cells = self.cells
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        all_digits = self.geometry.all_digits
+        best_index = -1
+        best_mask = 0
+        best_count = self.geometry.size + 1
+
+        eliminated = self.eliminated
+
+        for i, r, c, b in self.geometry.cell_units:
+            if cells[i] == 0:
+                mask = all_digits & ~(rows[r] | cols[c] | boxes[b] | eliminated[i])
+                count = popcount(mask)
+                if count < best_count:
+                    best_index, best_mask, best_count = i, mask, count
+                    if count <= floor:
+                        break
+
+        return best_index, best_mask
+
     def solve(self, find_all: bool = False) -> bool:
         """
         Solve the Sudoku puzzle using backtracking.
         Returns True if solution found, False otherwise.
         If find_all=True, finds all solutions (up to max_solutions).
+        Found solutions are stored in self.solutions; the solver state is
+        restored afterwards so it can be queried again.
         """
-        cell = self.find_mrv_cell()
-        
-        if cell is None:
-            # Grid is complete
-            if find_all:
-                self.solutions.append(copy.deepcopy(self.grid))
-                return len(self.solutions) >= self.max_solutions
-            return True
-        
-        row, col = cell
-        candidates = self.get_candidates(row, col)
-        
-        # Try each candidate
-        for num in candidates:
-            self.grid[row][col] = num
-            
-            if self.solve(find_all):
-                if not find_all:
-                    return True
-                if len(self.solutions) >= self.max_solutions:
-                    return True
-            
-            # Backtrack
-            self.grid[row][col] = 0
-        
-        return False
-    
-    def get_solution(self) -> Optional[List[List[int]]]:
-        """Get the solved grid. Returns None if unsolvable."""
+        limit = self.max_solutions if find_all else 1
+        self.solutions = []
+        solutions = self.iter_solutions()
+        try:
+            for solution in solutions:
+                self.solutions.append(solution)
+                if len(self.solutions) >= limit:
+                    break
+        finally:
+            solutions.close()
+        return bool(self.solutions)
+
+    def iter_solutions(self) -> Iterator[bytes]:
+        """
+        Yield the solutions one by one as cell bytes.
+
+        The search is an explicit stack of (cell, untried candidates) frames
+        rather than Python recursion, so enumeration can be resumed after
+        every solution. The solver must not be modified while the iterator
+        is suspended; its state is restored once the iterator is exhausted
+        or closed. Raises SolverTimeout if time_limit is exceeded.
+        """
+        self.propagations = 0
+        self.branches = 0
+        self.hardest = -1
+        self._nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.candidate_computations = 0
+        self.elapsed = 0.0
+        if self.has_conflict:
+            return
+
+        collect_stats = self.collect_stats
+        start = time.perf_counter() if collect_stats else 0.0
+        deadline = time.perf_counter() + self.time_limit if self.time_limit else None
+        use_propagation = self.use_propagation
+        # Propagation places every cell with a single candidate
+        floor = 2 if use_propagation else 1
+        placed_trail = self._placed_trail
+        base_mark = self._mark()
+        # Frames: [cell, untried candidate mask, mark before propagation, mark after, guess]
+        stack = []
+        # Frames on the stack whose cell had several candidates
+        depth = 0
+
+        try:
+            while True:
+                # Expand a new node: propagate, then pick the cell to branch on
+                self._nodes += 1
+                if deadline is not None and not self._nodes & 63 and time.perf_counter() > deadline:
+                    raise SolverTimeout(f"Search exceeded {self.time_limit} seconds")
+
+                node_mark = self._mark()
+                expanded = False
+                if use_propagation and not self.propagate():
+                    self.backtracks += 1
+                else:
+                    index, mask = self._select_cell(floor)
+                    if index < 0:
+                        # Grid is complete
+                        yield bytes(self.cells)
+                    elif mask:
+                        guess = bool(mask & (mask - 1))
+                        if guess:
+                            self.branches += 1
+                            depth += 1
+                            if collect_stats and depth > self.max_depth:
+                                self.max_depth = depth
+                        stack.append([index, mask, node_mark, self._mark(), guess])
+                        expanded = True
+                    else:
+                        self.backtracks += 1
+                if not expanded:
+                    # Solution or dead end: drop this node's deductions
+                    self._undo(node_mark)
+
+                # Try the next candidate of the deepest frame that has one left
+                while stack:
+                    frame = stack[-1]
+                    self._undo(frame[3])
+                    mask = frame[1]
+                    if mask:
+                        bit = mask & -mask
+                        frame[1] = mask ^ bit
+                        self.place(frame[0], bit.bit_length())
+                        placed_trail.append(frame[0])
+                        break
+                    # Backtrack
+                    self._undo(frame[2])
+                    if stack.pop()[4]:
+                        depth -= 1
+                else:
+                    return
+        finally:
+            self._undo(base_mark)
+            if collect_stats:
+                self.elapsed = time.perf_counter() - start
+
+    def clear_cell(self, row: int, col: int) -> None:
+        """Remove the given digit at (row, col) from the puzzle."""
+        self.unplace(row * self.geometry.size + col)
+
+    def set_cell(self, row: int, col: int, num: int) -> None:
+        """Put num back as a given at the empty cell (row, col); num must not conflict."""
+        self.place(row * self.geometry.size + col, num)
+
+    def has_alternative(self, row: int, col: int, num: int) -> bool:
+        """
+        Check whether the puzzle has a solution with a digit other than num at
+        the empty cell (row, col), i.e. solve with num excluded from that cell.
+        """
+        mark = self._mark()
+        self._eliminate(row * self.geometry.size + col, self.geometry.digit_bits[num])
+        solutions = self.iter_solutions()
+        try:
+            self.solutions = [next(solutions, None)]
+        finally:
+            solutions.close()
+            self._undo(mark)
+        if self.solutions[0] is None:
+            self.solutions = []
+        return bool(self.solutions)
+
+    @property
+    def grid(self) -> Grid:
+        """The puzzle as a list of rows."""
+        return from_bytes(self.cells)
+
+    def get_solution_cells(self) -> Optional[bytes]:
+        """Get the solution as cell bytes. Returns None if unsolvable."""
         if self.solve():
-            return self.grid
+            return self.solutions[0]
         return None
-    
-    def count_solutions(self) -> int:
-        """Count the number of solutions (up to max_solutions)."""
-        self.solutions = []
+
+    def get_solution(self) -> Optional[Grid]:
+        """Get the solved grid. Returns None if unsolvable."""
+        cells = self.get_solution_cells()
+        return from_bytes(cells) if cells is not None else None
+
+    def count_solutions(self, limit: Optional[int] = None) -> int:
+        """
+        Count the number of solutions, stopping once limit solutions are found
+        (defaults to max_solutions).
+        """
+        if limit is not None:
+            self.max_solutions = limit
         self.solve(find_all=True)
         return len(self.solutions)
-    
+
+    def search_stats(self) -> Optional[Dict]:
+        """
+        Counters of the last search: 'nodes' visited, 'backtracks', 'branches',
+        'max_depth' of guesses, 'candidate_computations' (whole-grid candidate
+        scans), 'propagations' and wall time in seconds ('elapsed').
+        None unless collect_stats was set before the search.
+        """
+        if not self.collect_stats:
+            return None
+        return {
+            'nodes': self._nodes,
+            'backtracks': self.backtracks,
+            'branches': self.branches,
+            'max_depth': self.max_depth,
+            'candidate_computations': self.candidate_computations,
+            'propagations': self.propagations,
+            'elapsed': self.elapsed,
+        }
+
     def is_valid_grid(self) -> bool:
         """Check if the initial grid is valid (no conflicts)."""
-        for row in range(9):
-            for col in range(9):
-                if self.grid[row][col] != 0:
-                    num = self.grid[row][col]
-                    self.grid[row][col] = 0
-                    if not self.is_valid(row, col, num):
-                        self.grid[row][col] = num
-                        return False
-                    self.grid[row][col] = num
-        return True
+        return not self.has_conflict
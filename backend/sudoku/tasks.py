@@ -0,0 +1,65 @@
+"""
+Picklable entry points for running solver and generator work in worker processes.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+
+from .engines import DEFAULT_ENGINE, create_solver
+from .generator import SudokuGenerator
+from .grid import Grid
+from .solver import SolverTimeout
+
+
+def solve_task(grid: Union[Grid, str, bytes], engine: str = DEFAULT_ENGINE,
+               time_limit: Optional[float] = None, stats: bool = False) -> Dict:
+    """
+    Solve grid and report the outcome as a dict with a 'status' of
+    'solved' (with 'solution' as cell bytes), 'invalid', 'unsolvable'
+    or 'timeout'. With stats, results of a search also carry the solver's
+    search_stats() under 'stats'.
+    """
+    solver = create_solver(grid, engine)
+    solver.time_limit = time_limit
+    solver.collect_stats = stats
+
+    if not solver.is_valid_grid():
+        return {'status': 'invalid'}
+
+    try:
+        solution = solver.get_solution_cells()
+    except SolverTimeout:
+        result = {'status': 'timeout'}
+    else:
+        if solution is None:
+            result = {'status': 'unsolvable'}
+        else:
+            result = {'status': 'solved', 'solution': solution}
+
+    if stats:
+        result['stats'] = solver.search_stats()
+    return result
+
+
+def generate_task(difficulty: str, engine: str = DEFAULT_ENGINE,
+                  method: str = 'search', size: int = 9,
+                  time_budget: Optional[float] = None) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Generate a (puzzle, solution) pair by search ('search'), by search with
+    candidates accepted by technique rating ('graded') or by transforming a
+    seed puzzle ('seeds'). Grids larger than 9x9 (size 16 or 25) are only
+    generated by search. time_budget caps the seconds of search and graded
+    generation (see SudokuGenerator.time_budget), so the work stops in the
+    worker too when the caller gives up.
+    """
+    generator = SudokuGenerator(engine, size)
+    generator.time_budget = time_budget
+    if method == 'seeds':
+        return generator.generate_from_seeds(difficulty)
+    if method == 'graded':
+        return generator.generate_graded(difficulty)
+    return generator.generate(difficulty)
+
+
+def solve_many_task(items: List[Tuple[int, bytes]], engine: str = DEFAULT_ENGINE,
+                    time_limit: Optional[float] = None) -> List[Tuple[int, Dict]]:
+    """Solve a chunk of (index, grid) pairs; returns (index, solve_task result) pairs."""
+    return [(index, solve_task(grid, engine, time_limit)) for index, grid in items]
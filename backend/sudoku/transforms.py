@@ -0,0 +1,89 @@
+"""
+Validity-preserving Sudoku transformations.
+
+Relabeling digits, permuting rows within a band (or columns within a stack),
+permuting bands (or stacks) and transposing all map valid puzzles to valid
+puzzles with the same number of solutions. A Transform combines a cell
+permutation with a digit relabeling and works on 81 cell bytes.
+"""
+import random
+from typing import List, Optional, Sequence
+
+
+class Transform:
+    """A cell permutation followed by a digit relabeling."""
+
+    __slots__ = ('positions', 'digits', '_table')
+
+    def __init__(self, positions: Sequence[int], digits: Sequence[int]):
+        """
+        positions[i] is the source index of output cell i; digits[num] is the
+        new label of digit num (digits[0] must be 0).
+        """
+        self.positions = tuple(positions)
+        self.digits = bytes(digits)
+        # 256-entry table for bytes.translate
+        self._table = self.digits + bytes(range(len(self.digits), 256))
+
+    @classmethod
+    def from_line_orders(cls, transpose: bool, row_order: Sequence[int],
+                         col_order: Sequence[int], digits: Sequence[int] = range(10)) -> 'Transform':
+        """
+        Build a transform that optionally transposes, then takes the rows in
+        row_order and the columns in col_order (both given as source lines).
+        """
+        if transpose:
+            positions = [col * 9 + row for row in row_order for col in col_order]
+        else:
+            positions = [row * 9 + col for row in row_order for col in col_order]
+        return cls(positions, digits)
+
+    def apply(self, cells: bytes) -> bytes:
+        """Transform 81 cell bytes."""
+        return bytes([cells[p] for p in self.positions]).translate(self._table)
+
+    def inverse(self) -> 'Transform':
+        """The transform that undoes this one."""
+        positions = [0] * 81
+        for i, source in enumerate(self.positions):
+            positions[source] = i
+        digits = [0] * 10
+        for num, label in enumerate(self.digits):
+            digits[label] = num
+        return Transform(positions, digits)
+
+    def unapply(self, cells: bytes) -> bytes:
+        """Map transformed cells back to the original frame."""
+        restored = bytearray(81)
+        relabeled = bytes(cells).translate(self._inverse_table())
+        for i, source in enumerate(self.positions):
+            restored[source] = relabeled[i]
+        return bytes(restored)
+
+    def _inverse_table(self) -> bytes:
+        """translate table of the inverse digit relabeling."""
+        table = bytearray(range(256))
+        for num, label in enumerate(self.digits):
+            table[label] = num
+        return bytes(table)
+
+
+def _random_line_order(rng: random.Random) -> List[int]:
+    """Random order of 9 lines: shuffle the bands, then the lines within each band."""
+    bands = rng.sample(range(3), 3)
+    return [band * 3 + line for band in bands for line in rng.sample(range(3), 3)]
+
+
+def random_transform(rng: Optional[random.Random] = None) -> Transform:
+    """
+    Uniformly random element of the Sudoku symmetry group: digit relabeling,
+    row/column permutations within bands/stacks, band/stack swaps and
+    transposition. Rotations and reflections are members of this group (a
+    quarter turn is a transpose followed by reversing the columns), so they
+    are covered as well.
+    """
+    rng = rng or random
+    digits = [0] + rng.sample(range(1, 10), 9)
+    return Transform.from_line_orders(
+        rng.random() < 0.5, _random_line_order(rng), _random_line_order(rng), digits
+    )
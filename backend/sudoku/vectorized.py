@@ -0,0 +1,192 @@
+"""
+NumPy checks of many grids at once.
+
+Grids are an (N, 9, 9) uint8 array (0 = empty). Digits become the solver's
+9-bit masks (bit d - 1 for digit d), and every check is a handful of array
+operations over all N grids instead of a Python loop per cell:
+
+- a unit has a repeated digit exactly when the sum of its masks differs
+  from their OR, since the masks are powers of two;
+- a cell's candidates are the digits missing from the OR of its row,
+  column and box;
+- a digit is a hidden single when it is a candidate of exactly one cell of
+  a unit, found by accumulating "seen once" and "seen twice" masks across
+  the unit's nine cells.
+
+This is a fast pre-pass for bulk jobs (validating imported puzzle sets,
+checking generator output) before any per-grid search: invalid grids are
+dropped and forced cells are known without building a solver. Requires
+NumPy, which the solvers themselves do not.
+"""
+from typing import Dict, Iterable, Tuple, Union
+
+import numpy as np
+
+from .grid import Grid, to_cells
+
+ALL_DIGITS = 0x1FF
+
+# Cell value -> digit mask (0 for empty cells)
+DIGIT_MASKS = np.array([0] + [1 << (num - 1) for num in range(1, 10)], dtype=np.uint16)
+# Mask -> number of digits in it
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(ALL_DIGITS + 1)], dtype=np.uint8)
+# Mask -> its digit if it holds exactly one, else 0
+SINGLE_DIGIT = np.zeros(ALL_DIGITS + 1, dtype=np.uint8)
+SINGLE_DIGIT[DIGIT_MASKS[1:]] = np.arange(1, 10, dtype=np.uint8)
+
+# Grids analyzed per block by analyze() and find_conflicts(), bounding the
+# size of the temporary arrays
+CHUNK_SIZE = 65536
+
+
+def to_array(grids: Union[np.ndarray, Iterable[Union[Grid, str, bytes]]]) -> np.ndarray:
+    """
+    (N, 9, 9) uint8 array of grids given as an array of N x 81 or N x 9 x 9
+    values, or as an iterable of any format accepted by to_cells().
+    Raises ValueError for malformed grids and for 16x16 and 25x25 grids,
+    which these checks do not handle.
+    """
+    if isinstance(grids, np.ndarray):
+        if grids.size % 81 or (grids.size and (grids.min() < 0 or grids.max() > 9)):
+            raise ValueError("Grid arrays must hold 81 values 0-9 per grid")
+        return np.ascontiguousarray(grids, dtype=np.uint8).reshape(-1, 9, 9)
+    cells = [bytes(to_cells(grid)) for grid in grids]
+    if any(len(grid) != 81 for grid in cells):
+        raise ValueError("Only 9x9 grids can be checked in bulk")
+    return np.frombuffer(b''.join(cells), dtype=np.uint8).reshape(-1, 9, 9)
+
+
+def _cells_first(grids: np.ndarray) -> np.ndarray:
+    """
+    Digit masks of (N, 9, 9) grids laid out as (row, col, grid): every unit
+    operation is then an elementwise operation on contiguous length-N rows.
+    """
+    return DIGIT_MASKS[np.ascontiguousarray(grids.transpose(1, 2, 0))]
+
+
+def _boxes(masks: np.ndarray) -> np.ndarray:
+    """(9, 9, N) masks regrouped as (box, cell within box, grid)."""
+    n = masks.shape[2]
+    return masks.reshape(3, 3, 3, 3, n).transpose(0, 2, 1, 3, 4).reshape(9, 9, n)
+
+
+def _box_to_cells(box_masks: np.ndarray) -> np.ndarray:
+    """(9, N) per-box masks spread to the (9, 9, N) cells of each box."""
+    n = box_masks.shape[1]
+    spread = np.broadcast_to(box_masks.reshape(3, 1, 3, 1, n), (3, 3, 3, 3, n))
+    return spread.reshape(9, 9, n)
+
+
+def _units(masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows, columns and boxes of (9, 9, N) masks, each as (unit, cell, grid)."""
+    return masks, masks.transpose(1, 0, 2), _boxes(masks)
+
+
+def _conflicts(masks: np.ndarray) -> np.ndarray:
+    conflict = np.zeros(masks.shape[2], dtype=bool)
+    for units in _units(masks):
+        repeated = units.sum(axis=1, dtype=np.uint16) != np.bitwise_or.reduce(units, axis=1)
+        conflict |= repeated.any(axis=0)
+    return conflict
+
+
+def _candidates(masks: np.ndarray) -> np.ndarray:
+    used = _box_to_cells(np.bitwise_or.reduce(_boxes(masks), axis=1))
+    used |= np.bitwise_or.reduce(masks, axis=1)[:, None, :]
+    used |= np.bitwise_or.reduce(masks, axis=0)[None, :, :]
+    candidates = np.bitwise_and(~used, ALL_DIGITS, out=used)
+    candidates *= masks == 0
+    return candidates
+
+
+def _exactly_once(units: np.ndarray) -> np.ndarray:
+    """(9, N) masks of the digits set in exactly one cell of each unit."""
+    once = np.zeros((9, units.shape[2]), dtype=np.uint16)
+    twice = np.zeros_like(once)
+    for k in range(9):
+        cell = units[:, k]
+        twice |= once & cell
+        once |= cell
+    return once & ~twice
+
+
+def find_conflicts(grids: np.ndarray, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """(N,) bool: True for grids with a digit repeated in a row, column or box."""
+    conflict = np.empty(grids.shape[0], dtype=bool)
+    for start in range(0, grids.shape[0], chunk_size):
+        block = grids[start:start + chunk_size]
+        conflict[start:start + len(block)] = _conflicts(_cells_first(block))
+    return conflict
+
+
+def candidate_masks(grids: np.ndarray) -> np.ndarray:
+    """
+    (N, 9, 9) uint16 candidate masks: the digits not yet placed in a cell's
+    row, column or box for empty cells, 0 for filled ones.
+    """
+    return np.ascontiguousarray(_candidates(_cells_first(grids)).transpose(2, 0, 1))
+
+
+def _analyze(grids: np.ndarray) -> Dict[str, np.ndarray]:
+    masks = _cells_first(grids)
+    candidates = _candidates(masks)
+    empty = candidates == 0
+    empty &= masks == 0
+
+    # Digits that only fit one cell of some unit of that cell
+    rows, cols, boxes = _units(candidates)
+    unique = (
+        _exactly_once(rows)[:, None, :]
+        | _exactly_once(cols)[None, :, :]
+        | _box_to_cells(_exactly_once(boxes))
+    )
+    hidden = candidates & unique
+
+    # Dead ends: an empty cell without candidates, a cell that must hold two
+    # different hidden singles, or a digit with no place left in a unit
+    dead_end = (empty | (POPCOUNT[hidden] > 1)).any(axis=(0, 1))
+    for placed, open_ in zip(_units(masks), _units(candidates)):
+        covered = np.bitwise_or.reduce(placed, axis=1) | np.bitwise_or.reduce(open_, axis=1)
+        dead_end |= (covered != ALL_DIGITS).any(axis=0)
+
+    conflict = _conflicts(masks)
+    return {
+        'conflict': conflict,
+        'solved': ~conflict & (masks != 0).all(axis=(0, 1)),
+        'dead_end': dead_end,
+        'candidates': candidates.transpose(2, 0, 1),
+        'naked_singles': SINGLE_DIGIT[candidates].transpose(2, 0, 1),
+        'hidden_singles': SINGLE_DIGIT[hidden].transpose(2, 0, 1),
+    }
+
+
+def analyze(grids: np.ndarray, chunk_size: int = CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Check an (N, 9, 9) uint8 array of grids. Returns a dict of arrays:
+    - 'conflict' (N,) bool: a digit repeats in a row, column or box
+    - 'solved' (N,) bool: every cell filled, without conflicts
+    - 'dead_end' (N,) bool: the grid cannot be completed because an empty
+      cell has no candidates, a digit has no place left in a unit, or one
+      cell is the only place for two digits
+    - 'candidates' (N, 9, 9) uint16: candidate_masks()
+    - 'naked_singles' (N, 9, 9) uint8: the only candidate of each empty
+      cell that has one, else 0
+    - 'hidden_singles' (N, 9, 9) uint8: the digit that fits nowhere else in
+      one of the cell's units, else 0
+    Grids with a conflict are reported but their candidates and singles
+    are meaningless.
+    """
+    n = grids.shape[0]
+    results = {
+        'conflict': np.empty(n, dtype=bool),
+        'solved': np.empty(n, dtype=bool),
+        'dead_end': np.empty(n, dtype=bool),
+        'candidates': np.empty((n, 9, 9), dtype=np.uint16),
+        'naked_singles': np.empty((n, 9, 9), dtype=np.uint8),
+        'hidden_singles': np.empty((n, 9, 9), dtype=np.uint8),
+    }
+    for start in range(0, n, chunk_size):
+        block = _analyze(grids[start:start + chunk_size])
+        for key, values in block.items():
+            results[key][start:start + len(values)] = values
+    return results